@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import argparse
+import copy
+import json
+import platform
+import subprocess
+import tempfile
+import time
+import numpy as np
+import numba
+from FP_config import Config
+from FP_core import Simulation, Fleet, process_detections, warmup
+from FP_events import EventSimulation
+from FP_import_time import MODULES, measure
+
+ENGINES = {'step': (Simulation, False), 'kernel': (Simulation, True), 'events': (EventSimulation, False)}
+
+WARMUP_PROBE = """
+import time
+start = time.perf_counter()
+import FP_core
+FP_core.warmup()
+print(time.perf_counter() - start)
+"""
+
+
+def parameters(n):
+    return Config(N=n).simulation_parameters()
+
+
+def scaled_ticks(ticks, n):
+    return max(50, ticks * 500 // n)
+
+
+def best_of(repeat, function):
+    return min(function() for _ in range(repeat))
+
+
+def settle(simulation_class, n, seed, ticks):
+    simulation = simulation_class(**parameters(n), seed=seed, threads=numba.config.NUMBA_NUM_THREADS)
+    simulation.run(until=ticks - 1)
+    return simulation.snapshot()
+
+
+def bench_step(state, engine, ticks, repeat):
+    simulation_class, kernel = ENGINES[engine]
+    threads = numba.config.NUMBA_NUM_THREADS if kernel else None
+
+    def once():
+        simulation = simulation_class.restore(dict(copy.deepcopy(state), threads=threads))
+        begin = simulation.time
+        start = time.perf_counter()
+        simulation.run(until=begin + ticks - 1)
+        return time.perf_counter() - start
+
+    seconds = best_of(repeat, once)
+    return {'name': f"step.{engine}", 'n': state['population'].n, 'ticks': ticks, 'seconds': seconds,
+            'value': ticks / seconds, 'unit': "тактов/с"}
+
+
+def bench_detections(state, ticks, repeat):
+    t_signal = state['t_signal']
+
+    def once():
+        population = copy.deepcopy(state['population'])
+        elapsed = 0.0
+        for tick in range(state['time'], state['time'] + ticks):
+            population.update(tick)
+            start = time.perf_counter()
+            process_detections(population, t_signal)
+            elapsed += time.perf_counter() - start
+        return elapsed
+
+    seconds = best_of(repeat, once)
+    return {'name': "process_detections", 'n': state['population'].n, 'ticks': ticks, 'seconds': seconds,
+            'value': ticks / seconds, 'unit': "вызовов/с"}
+
+
+def bench_lifecycle(state, batches, seed, repeat):
+    n = state['population'].n
+    rng = np.random.default_rng(seed)
+    batch = max(1, n // 100)
+    slots = [np.sort(rng.choice(n, batch, replace=False)) for _ in range(batches)]
+
+    def once():
+        population = copy.deepcopy(state['population'])
+        start = time.perf_counter()
+        for tick, dead in enumerate(slots, start=state['time']):
+            population.remove(dead)
+            population.spawn(dead, tick)
+        return time.perf_counter() - start
+
+    seconds = best_of(repeat, once)
+    return {'name': "births_deaths", 'n': n, 'civilizations': batch * batches, 'seconds': seconds,
+            'value': batch * batches / seconds, 'unit': "цивилизаций/с"}
+
+
+def bench_ships(ships, ticks, seed, repeat):
+    config = Config()
+    rng = np.random.default_rng(seed)
+    points = rng.uniform(-config.R, config.R, size=(ships, 4)).tolist()
+    launch_times = rng.integers(0, ticks, size=ships).tolist()
+
+    def once():
+        fleet = Fleet(config.spaceships_speed)
+        order = sorted(range(ships), key=launch_times.__getitem__)
+        start = time.perf_counter()
+        launched = 0
+        for tick in range(ticks):
+            while launched < ships and launch_times[order[launched]] == tick:
+                i = order[launched]
+                fleet.launch(i, i, *points[i], tick)
+                launched += 1
+            arrived = fleet.land(tick)
+            if len(arrived):
+                fleet.release(arrived)
+            fleet.positions(fleet.flying(), tick)
+        return time.perf_counter() - start
+
+    seconds = best_of(repeat, once)
+    return {'name': "ships", 'ships': ships, 'ticks': ticks, 'seconds': seconds,
+            'value': ticks / seconds, 'unit': "тактов/с"}
+
+
+def bench_warmup():
+    directory = os.path.dirname(os.path.abspath(__file__))
+    results = []
+    with tempfile.TemporaryDirectory() as cache:
+        env = dict(os.environ, NUMBA_CACHE_DIR=cache)
+        for name in ("jit_warmup.cold", "jit_warmup.cached"):
+            output = subprocess.run([sys.executable, "-c", WARMUP_PROBE], cwd=directory, env=env,
+                                    capture_output=True, text=True, check=True).stdout
+            seconds = float(output.strip().splitlines()[-1])
+            results.append({'name': name, 'seconds': seconds, 'value': seconds, 'unit': "с"})
+    return results
+
+
+def bench_imports(repeat):
+    return [{'name': f"import.{result['module']}", 'seconds': result['seconds'], 'value': result['seconds'],
+             'unit': "с"} for result in (measure(module, repeat) for module in MODULES)]
+
+
+def key(result):
+    return result['name'] + (f"[{result['n']}]" if 'n' in result else "")
+
+
+def environment():
+    return {'python': platform.python_version(), 'numpy': np.__version__, 'numba': numba.__version__,
+            'platform': platform.platform(), 'processor': platform.processor(), 'cpus': os.cpu_count(),
+            'numba_threads': numba.config.NUMBA_NUM_THREADS}
+
+
+def compare(report, path):
+    with open(path, 'r', encoding='utf-8') as f:
+        previous = json.load(f)
+    for setting in ('seed', 'ticks', 'settle'):
+        if previous.get(setting) != report[setting]:
+            print(f"Внимание: {setting} = {previous.get(setting)} в {os.path.basename(path)}, "
+                  f"сейчас {report[setting]}; замеры несопоставимы")
+    baseline = {key(result): result for result in previous['results']}
+    for result in report['results']:
+        old = baseline.get(key(result))
+        if old is None:
+            continue
+        ratio = result['value'] / old['value'] if old['value'] else float('inf')
+        if result['unit'] == "с":
+            ratio = 1 / ratio if ratio else float('inf')
+        print(f"{key(result):<28} {ratio:6.2f}x относительно {os.path.basename(path)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Замер производительности ядра симуляции")
+    parser.add_argument("--sizes", default="500,5000,50000", help="значения N через запятую")
+    parser.add_argument("--ticks", type=int, default=2000,
+                        help="число тактов на один замер при N=500 (для больших N обратно пропорционально)")
+    parser.add_argument("--settle", type=int, default=Config().t_stop,
+                        help="тактов до начала замера, чтобы радиусы сигналов вышли на стационарный режим")
+    parser.add_argument("--engines", default=",".join(ENGINES), help="режимы: " + ", ".join(ENGINES))
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3, help="повторов на замер (берется лучший)")
+    parser.add_argument("--skip-warmup", action="store_true", help="не замерять компиляцию и импорт")
+    parser.add_argument("--output", default="benchmark.json", help="JSON-файл с результатами")
+    parser.add_argument("--compare", help="JSON-файл прошлого замера для сравнения")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    engines = args.engines.split(",")
+    unknown = set(engines) - set(ENGINES)
+    if unknown:
+        parser.error(f"неизвестный режим: {', '.join(sorted(unknown))}")
+
+    results = []
+
+    def add(*measured):
+        for result in measured:
+            results.append(result)
+            print(f"{key(result):<28} {result['value']:14.4f} {result['unit']}", flush=True)
+
+    if not args.skip_warmup:
+        add(*bench_warmup())
+        add(*bench_imports(args.repeat))
+    warmup()
+    for n in sizes:
+        ticks = scaled_ticks(args.ticks, n)
+        states = {}
+        for engine in engines:
+            simulation_class = ENGINES[engine][0]
+            if simulation_class not in states:
+                states[simulation_class] = settle(simulation_class, n, args.seed, args.settle)
+            add(bench_step(states[simulation_class], engine, ticks, args.repeat))
+        state = states.get(Simulation) or settle(Simulation, n, args.seed, args.settle)
+        add(bench_detections(state, ticks, args.repeat))
+        add(bench_lifecycle(state, 100, args.seed, args.repeat))
+    add(bench_ships(10000, args.ticks, args.seed, args.repeat))
+
+    report = {'created': time.strftime("%Y-%m-%dT%H:%M:%S"), 'seed': args.seed, 'ticks': args.ticks,
+              'settle': args.settle,
+              'environment': environment(), 'results': results}
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=1)
+    if args.compare:
+        compare(report, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import os
+import pickle
+import threading
+
+
+def save_checkpoint(simulation_class, state, path):
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        pickle.dump((simulation_class, state), f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_path, path)
+
+
+def load_checkpoint(path, recorder=None):
+    with open(path, 'rb') as f:
+        simulation_class, state = pickle.load(f)
+    return simulation_class.restore(state, recorder)
+
+
+class Checkpointer:
+    def __init__(self, path, interval):
+        self.path = path
+        self.interval = interval
+        self.next_checkpoint = None
+        self.writer = None
+
+    def __call__(self, simulation):
+        if self.next_checkpoint is None:
+            self.next_checkpoint = (simulation.time // self.interval + 1) * self.interval
+        if simulation.time >= self.next_checkpoint:
+            self.save(simulation)
+            self.next_checkpoint = (simulation.time // self.interval + 1) * self.interval
+
+    def save(self, simulation):
+        state = simulation.snapshot()
+        self.wait()
+        self.writer = threading.Thread(target=save_checkpoint, args=(type(simulation), state, self.path),
+                                       daemon=True)
+        self.writer.start()
+
+    def wait(self):
+        if self.writer is not None:
+            self.writer.join()
+            self.writer = None
+
+    def close(self, simulation):
+        self.save(simulation)
+        self.wait()
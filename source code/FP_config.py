@@ -0,0 +1,65 @@
+from dataclasses import dataclass, fields, asdict
+
+RUN_OPTIONS = ('Disp', 'FPS', 'speed', 'headless', 'event_driven', 'threads', 'metrics_path',
+               'checkpoint_path', 'checkpoint_interval', 'resume', 'seed', 'show_plot',
+               'shared_memory', 'results_path', 'profile_sample')
+
+@dataclass
+class Config:
+    N: int = 500
+    R: int = 400
+    Disp: int = 900
+    A: int = 1000
+    spaceships_speed: float = 0.5
+    t_signal: int = 3
+    t_stop: int = 1000
+    FPS: int = 100
+    speed: int = 100
+    t_range_min: int = 6000000
+    t_range_max: int = 100000000
+    t_0_range_min: int = 0
+    t_0_range_max: int = 100000000
+    t_intel_range_min: int = 4000000
+    t_intel_range_max: int = 6000000
+    start_record: int = 0
+    stop_record: int = 100000
+    step: int = 1000
+    headless: bool = False
+    event_driven: bool = False
+    threads: int = 0
+    metrics_path: str = ""
+    checkpoint_path: str = ""
+    checkpoint_interval: int = 10000
+    resume: bool = False
+    seed: int = -1
+    show_plot: bool = True
+    shared_memory: str = ""
+    results_path: str = "simulation_results.npz"
+    profile_sample: int = 0
+
+    @classmethod
+    def from_dict(cls, values):
+        types = {field.name: type(field.default) for field in fields(cls)}
+        unknown = set(values) - set(types)
+        if unknown:
+            raise ValueError(f"Неизвестные параметры: {', '.join(sorted(unknown))}")
+        config = cls(**{name: types[name](value) for name, value in values.items()})
+        if config.N <= 0 or config.R <= 0:
+            raise ValueError("N и R должны быть положительными")
+        if config.step <= 0:
+            raise ValueError("step должен быть положительным")
+        if not 0 <= config.start_record <= config.stop_record:
+            raise ValueError("нужно 0 <= start_record <= stop_record")
+        return config
+
+    def to_dict(self):
+        return asdict(self)
+
+    def simulation_parameters(self):
+        A = self.A
+        return dict(n=self.N, radius=self.R,
+                    t_range=[int(self.t_range_min / A), int(self.t_range_max / A)],
+                    t_0_range=[int(self.t_0_range_min / A), int(self.t_0_range_max / A)],
+                    t_intel_range=[int(self.t_intel_range_min / A), int(self.t_intel_range_max / A)],
+                    t_signal=self.t_signal, t_stop=self.t_stop, spaceships_speed=self.spaceships_speed,
+                    start_record=self.start_record, stop_record=self.stop_record, step=self.step)
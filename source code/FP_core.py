@@ -0,0 +1,587 @@
+import math
+import copy
+import heapq
+import numpy as np
+import numba
+from numba import njit, prange
+
+
+ANIMATION_SPEED = 5
+
+
+@njit(fastmath=True, cache=True)
+def calculate_distance(x1, y1, x2, y2):
+    return math.sqrt((x2 - x1) ** 2 + (y2 - y1) ** 2)
+
+
+@njit(fastmath=True, cache=True)
+def normalize_vector(x, y, distance):
+    if distance > 0:
+        return x / distance, y / distance
+    return 0.0, 0.0
+
+
+@njit(cache=True)
+def travel_ticks(x, y, target_x, target_y, direction_x, direction_y, speed):
+    if speed <= 0:
+        return -1
+    ticks = 1
+    while True:
+        x += direction_x * speed
+        y += direction_y * speed
+        if calculate_distance(x, y, target_x, target_y) <= speed:
+            return ticks
+        ticks += 1
+
+
+def ship_course(x, y, target_x, target_y, speed):
+    distance = calculate_distance(x, y, target_x, target_y)
+    direction_x, direction_y = normalize_vector(target_x - x, target_y - y, distance)
+    return direction_x, direction_y, travel_ticks(x, y, target_x, target_y, direction_x, direction_y, speed)
+
+
+@njit(cache=True)
+def listeners_in_ring(emitter, x, y, signal_radius, listeners, t_signal, found_listeners, found_emitters, offset):
+    count = 0
+    tested = 0
+    ex = x[emitter]
+    ey = y[emitter]
+    outer_edge = signal_radius[emitter]
+    inner_edge = max(0, outer_edge - t_signal)
+    for listener in listeners:
+        if listener == emitter:
+            continue
+        tested += 1
+        distance = math.sqrt((ex - x[listener]) ** 2 + (ey - y[listener]) ** 2)
+        if distance <= outer_edge and distance >= inner_edge:
+            if offset >= 0:
+                found_listeners[offset + count] = listener
+                found_emitters[offset + count] = emitter
+            count += 1
+    return count, tested
+
+
+@njit(cache=True)
+def ring_pairs(x, y, signal_radius, listeners, emitters, t_signal):
+    empty = np.empty(0, dtype=np.int64)
+    offsets = np.zeros(len(emitters) + 1, dtype=np.int64)
+    tested = 0
+    for k in range(len(emitters)):
+        count, checked = listeners_in_ring(emitters[k], x, y, signal_radius, listeners, t_signal, empty, empty, -1)
+        offsets[k + 1] = offsets[k] + count
+        tested += checked
+    found_listeners = np.empty(offsets[-1], dtype=np.int64)
+    found_emitters = np.empty(offsets[-1], dtype=np.int64)
+    if offsets[-1] > 0:
+        for k in range(len(emitters)):
+            if offsets[k + 1] > offsets[k]:
+                listeners_in_ring(emitters[k], x, y, signal_radius, listeners, t_signal,
+                                  found_listeners, found_emitters, offsets[k])
+    return found_listeners, found_emitters, tested
+
+
+@njit(parallel=True, cache=True)
+def tick_kernel(time, t_0, t_intel, t_start, t, signal_radius, signal_active, intel, listening,
+                x, y, t_signal, t_stop):
+    n = len(t)
+    emitted = 0
+    for i in prange(n):
+        t[i] = t_0[i] + time - t_start[i]
+        if t[i] > t_intel[i]:
+            signal_active[i] = True
+        if signal_active[i]:
+            signal_radius[i] += 1
+            if signal_radius[i] > t_stop:
+                signal_active[i] = False
+        listening[i] = signal_active[i] and intel[i] and signal_radius[i] <= t_signal
+        if signal_active[i] and intel[i] and signal_radius[i] == 1:
+            emitted += 1
+
+    emitters = np.flatnonzero(signal_active & intel)
+    listeners = np.flatnonzero(listening)
+    offsets = np.zeros(len(emitters) + 1, dtype=np.int64)
+    tested = 0
+    if len(listeners):
+        empty = np.empty(0, dtype=np.int64)
+        for k in prange(len(emitters)):
+            count, checked = listeners_in_ring(emitters[k], x, y, signal_radius, listeners, t_signal,
+                                               empty, empty, -1)
+            offsets[k + 1] = count
+            tested += checked
+        offsets = np.cumsum(offsets)
+    found_listeners = np.empty(offsets[-1], dtype=np.int64)
+    found_emitters = np.empty(offsets[-1], dtype=np.int64)
+    if offsets[-1] > 0:
+        for k in prange(len(emitters)):
+            if offsets[k + 1] > offsets[k]:
+                listeners_in_ring(emitters[k], x, y, signal_radius, listeners, t_signal,
+                                  found_listeners, found_emitters, offsets[k])
+    return emitted, found_listeners, found_emitters, tested
+
+
+class Fleet:
+    columns = ('owner', 'target', 'x', 'y', 'target_x', 'target_y', 'direction_x', 'direction_y',
+               'launched', 'arrival')
+
+    def __init__(self, speed, capacity=64):
+        self.speed = speed
+        self.count = 0
+        for name in self.columns:
+            dtype = np.int64 if name in ('owner', 'target', 'launched', 'arrival') else np.float64
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+        self.active = np.zeros(capacity, dtype=bool)
+        self.free = list(range(capacity - 1, -1, -1))
+        self.arrivals = []
+
+    def grow(self):
+        capacity = len(self.owner)
+        for name in self.columns + ('active',):
+            column = getattr(self, name)
+            setattr(self, name, np.concatenate((column, np.zeros_like(column))))
+        self.free.extend(range(2 * capacity - 1, capacity - 1, -1))
+
+    def launch(self, owner, target, x, y, target_x, target_y, time):
+        direction_x, direction_y, ticks = ship_course(x, y, target_x, target_y, self.speed)
+        if ticks <= 0:
+            return -1
+        if not self.free:
+            self.grow()
+
+        i = self.free.pop()
+        self.owner[i] = owner
+        self.target[i] = target
+        self.x[i] = x
+        self.y[i] = y
+        self.target_x[i] = target_x
+        self.target_y[i] = target_y
+        self.direction_x[i] = direction_x
+        self.direction_y[i] = direction_y
+        self.launched[i] = time
+        self.arrival[i] = time + ticks
+        self.active[i] = True
+        self.count += 1
+        heapq.heappush(self.arrivals, (time + ticks, i))
+        return i
+
+    def land(self, time):
+        slots = []
+        while self.arrivals and self.arrivals[0][0] <= time:
+            slots.append(heapq.heappop(self.arrivals)[1])
+        return np.array(slots, dtype=np.int64)
+
+    def release(self, slots):
+        self.active[slots] = False
+        self.free.extend(slots.tolist())
+        self.count -= len(slots)
+
+    def flying(self):
+        return np.flatnonzero(self.active)
+
+    def positions(self, slots, time):
+        distance = (time - self.launched[slots]) * self.speed
+        return (self.x[slots] + self.direction_x[slots] * distance,
+                self.y[slots] + self.direction_y[slots] * distance)
+
+
+def splitmix64(x):
+    x = np.asarray(x, dtype=np.uint64) + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+class CounterRandom:
+    def __init__(self, seed=None):
+        seed_sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+        self.entropy = seed_sequence.entropy
+        self.key = seed_sequence.generate_state(1, np.uint64)[0]
+
+    def uniform(self, slots, generations, draw):
+        x = splitmix64(self.key ^ splitmix64(slots))
+        x = splitmix64(x ^ np.asarray(generations, dtype=np.uint64))
+        x = splitmix64(x ^ np.uint64(draw))
+        return (x >> np.uint64(11)) * (1.0 / 2 ** 53)
+
+    def integers(self, low, high, slots, generations, draw):
+        return low + (self.uniform(slots, generations, draw) * (high - low + 1)).astype(np.int64)
+
+
+class DetectionMemory:
+    def __init__(self):
+        self.pairs = set()
+        self.partners = {}
+
+    @staticmethod
+    def key(a, b):
+        a, b = int(a), int(b)
+        return (a << 64) | b if a < b else (b << 64) | a
+
+    def __contains__(self, pair):
+        return self.key(*pair) in self.pairs
+
+    def __len__(self):
+        return len(self.pairs)
+
+    def add(self, a, b):
+        self.pairs.add(self.key(a, b))
+        a, b = int(a), int(b)
+        self.partners.setdefault(a, []).append(b)
+        self.partners.setdefault(b, []).append(a)
+
+    def forget(self, ids):
+        for a in ids:
+            for b in self.partners.pop(a, ()):
+                self.pairs.discard(self.key(a, b))
+
+
+class Population:
+    def __init__(self, n, radius, t_range, t_0_range, t_intel_range, t_stop, seed=None):
+        self.n = n
+        self.radius = radius
+        self.t_range = t_range
+        self.t_0_range = t_0_range
+        self.t_intel_range = t_intel_range
+        self.t_stop = t_stop
+        self.random = CounterRandom(seed)
+
+        self.x = np.zeros(n)
+        self.y = np.zeros(n)
+        self.t_0 = np.zeros(n, dtype=np.int64)
+        self.t_intel = np.zeros(n, dtype=np.int64)
+        self.t_start = np.zeros(n, dtype=np.int64)
+        self.t_end = np.zeros(n, dtype=np.int64)
+        self.t = np.zeros(n, dtype=np.int64)
+        self.signal_radius = np.zeros(n, dtype=np.int64)
+        self.signal_active = np.zeros(n, dtype=bool)
+        self.intel = np.zeros(n, dtype=bool)
+        self.was_detected = np.zeros(n, dtype=bool)
+        self.detected_others = np.zeros(n, dtype=bool)
+        self.listening = np.zeros(n, dtype=bool)
+        self.generation = np.zeros(n, dtype=np.int64)
+        self.detections = DetectionMemory()
+
+    def random_points(self, slots, draw):
+        generations = self.generation[slots]
+        r = self.radius * np.sqrt(self.random.uniform(slots, generations, draw))
+        phi = 2 * np.pi * self.random.uniform(slots, generations, draw + 1)
+        return r * np.cos(phi), r * np.sin(phi)
+
+    def random_times(self, time_range, slots, draw):
+        return self.random.integers(time_range[0], time_range[1], slots, self.generation[slots], draw)
+
+    def populate(self, attempts=10):
+        slots = np.arange(self.n)
+        for attempt in range(attempts):
+            draw = 5 * attempt
+            x, y = self.random_points(slots, draw)
+            t_0 = self.random_times(self.t_0_range, slots, draw + 2)
+            t_intel = self.random_times(self.t_intel_range, slots, draw + 3)
+            t_end = self.random_times(self.t_range, slots, draw + 4)
+
+            alive = t_0 < t_end
+            placed = slots[alive]
+            self.x[placed] = x[alive]
+            self.y[placed] = y[alive]
+            self.t_0[placed] = t_0[alive]
+            self.t_intel[placed] = t_intel[alive]
+            self.t_end[placed] = t_end[alive]
+            self.t_start[placed] = 0
+            self.t[placed] = t_0[alive]
+            self.intel[placed] = t_intel[alive] > t_0[alive]
+            slots = slots[~alive]
+            if len(slots) == 0:
+                break
+
+        if len(slots):
+            self.spawn(slots, 0)
+
+    def kill(self):
+        dead = np.flatnonzero(self.t >= self.t_end)
+        self.remove(dead)
+        return dead
+
+    def remove(self, slots):
+        self.detections.forget(self.id(slots).tolist())
+
+    def spawn(self, slots, time):
+        if len(slots) == 0:
+            return
+        self.generation[slots] += 1
+        self.x[slots], self.y[slots] = self.random_points(slots, 0)
+        self.t_0[slots] = 0
+        self.t_intel[slots] = self.random_times(self.t_intel_range, slots, 2)
+        self.t_end[slots] = self.random_times(self.t_range, slots, 3)
+        self.t_start[slots] = time
+        self.t[slots] = 0
+        self.signal_radius[slots] = 0
+        self.signal_active[slots] = False
+        self.intel[slots] = self.t_intel[slots] > 0
+        self.was_detected[slots] = False
+        self.detected_others[slots] = False
+
+    def update(self, time):
+        np.subtract(self.t_0 + time, self.t_start, out=self.t)
+        self.signal_active |= self.t > self.t_intel
+        self.signal_radius[self.signal_active] += 1
+        self.signal_active &= self.signal_radius <= self.t_stop
+
+    def emitted_count(self):
+        return int(np.count_nonzero(self.signal_active & self.intel & (self.signal_radius == 1)))
+
+    def id(self, slots):
+        return self.generation[slots] * self.n + slots
+
+    def alive(self, ids):
+        return self.generation[ids % self.n] == ids // self.n
+
+    def slot(self, id):
+        slot = id % self.n
+        return slot if self.generation[slot] == id // self.n else -1
+
+
+def accept_detections(population, listeners, emitters):
+    detections = population.detections
+    found = []
+    for listener, emitter, listener_id, emitter_id in zip(listeners.tolist(), emitters.tolist(),
+                                                          population.id(listeners).tolist(),
+                                                          population.id(emitters).tolist()):
+        if (listener_id, emitter_id) not in detections:
+            found.append((listener, emitter, listener_id, emitter_id))
+
+    for listener, emitter, listener_id, emitter_id in found:
+        detections.add(listener_id, emitter_id)
+        population.detected_others[listener] = True
+        population.was_detected[emitter] = True
+    return [(listener, emitter) for listener, emitter, _, _ in found]
+
+
+def process_detections(population, t_signal, profiler=None):
+    emitting = population.signal_active & population.intel
+    listening = emitting & (population.signal_radius <= t_signal)
+    if not listening.any():
+        return []
+
+    listeners, emitters, tested = ring_pairs(population.x, population.y, population.signal_radius,
+                                             np.flatnonzero(listening), np.flatnonzero(emitting), t_signal)
+    if profiler:
+        profiler.mark('detections.accept')
+        profiler.count('pairs_tested', tested)
+    return accept_detections(population, listeners, emitters)
+
+
+def fused_step(population, time, t_signal, t_stop, profiler=None):
+    emitted, listeners, emitters, tested = tick_kernel(
+        time, population.t_0, population.t_intel, population.t_start, population.t,
+        population.signal_radius, population.signal_active, population.intel, population.listening,
+        population.x, population.y, t_signal, t_stop)
+    if profiler:
+        profiler.mark('detections.accept')
+        profiler.count('pairs_tested', tested)
+    return emitted, accept_detections(population, listeners, emitters)
+
+
+class Simulation:
+    def __init__(self, n, radius, t_range, t_0_range, t_intel_range, t_signal, t_stop, spaceships_speed,
+                 start_record, stop_record, step, seed=None, threads=None, recorder=None):
+        self.t_signal = t_signal
+        self.t_stop = t_stop
+        self.stop_record = stop_record
+        self.step_record = step
+
+        self.population = Population(n, radius, t_range, t_0_range, t_intel_range, t_stop, seed)
+        self.population.populate()
+        self.fleet = Fleet(spaceships_speed)
+        self.threads = threads
+        if threads:
+            numba.set_num_threads(min(threads, numba.config.NUMBA_NUM_THREADS))
+        self.time = 0
+        self.running = False
+        self.observers = []
+        self.profiler = None
+
+        self.find_count = 0
+        self.signals_emitted_count = 0
+        self.contact_count = 0
+        self.visit_count = 0
+        self.missed_visit_count = 0
+
+        arrays_size = int(stop_record / step + 1)
+        self.times = np.zeros(arrays_size)
+        self.civ_number = np.zeros(arrays_size)
+        self.detected_number = np.zeros(arrays_size)
+        self.next_step = start_record
+        self.array_count = 0
+        self.recorder = recorder
+        self.next_metrics = start_record
+
+    def metrics(self):
+        population = self.population
+        return (self.time, population.n, self.signals_emitted_count, self.find_count,
+                int(np.count_nonzero(population.signal_active & population.intel)),
+                int(np.count_nonzero(self.owns(self.fleet.flying()))),
+                self.visit_count, self.contact_count, self.missed_visit_count)
+
+    def next_record(self):
+        tick = self.next_step if self.next_step <= self.stop_record else math.inf
+        if self.recorder is not None:
+            tick = min(tick, self.next_metrics)
+        return tick
+
+    def record(self):
+        if self.time == self.next_step and self.time <= self.stop_record:
+            self.times[self.array_count] = self.time
+            self.civ_number[self.array_count] = self.signals_emitted_count
+            self.detected_number[self.array_count] = self.find_count
+            self.array_count += 1
+            self.next_step += self.step_record
+        if self.recorder is not None and self.time == self.next_metrics:
+            self.recorder.append(self.metrics())
+            self.next_metrics += self.step_record
+
+    def signal_radius(self, slot):
+        return self.population.signal_radius[slot]
+
+    def launch(self, listener, emitter):
+        population = self.population
+        self.fleet.launch(population.id(listener), population.id(emitter), population.x[listener],
+                          population.y[listener], population.x[emitter], population.y[emitter], self.time)
+
+    def owns(self, slots):
+        return self.population.alive(self.fleet.owner[slots])
+
+    def ships(self):
+        fleet = self.fleet
+        slots = fleet.flying()
+        slots = slots[self.owns(slots)]
+        time = self.time - 1
+        x, y = fleet.positions(slots, time)
+        frames = (time - fleet.launched[slots]) // ANIMATION_SPEED % 4
+        return x, y, fleet.direction_x[slots], fleet.direction_y[slots], frames
+
+    def visit(self, target):
+        target = self.population.slot(target)
+        if target < 0:
+            self.missed_visit_count += 1
+        elif self.signal_radius(target) <= self.t_signal and self.population.intel[target]:
+            self.contact_count += 1
+            self.visit_count += 1
+        else:
+            self.visit_count += 1
+
+    def step(self):
+        population = self.population
+        fleet = self.fleet
+        profiler = self.profiler
+        if profiler:
+            profiler.begin(self.time)
+            profiler.mark('deaths')
+        dead = population.kill()
+
+        if profiler:
+            profiler.mark('record')
+        self.record()
+
+        if profiler:
+            profiler.mark('births')
+        population.spawn(dead, self.time)
+        if self.threads:
+            if profiler:
+                profiler.mark('kernel')
+            emitted, found = fused_step(population, self.time, self.t_signal, self.t_stop, profiler)
+        else:
+            if profiler:
+                profiler.mark('update')
+            population.update(self.time)
+            if profiler:
+                profiler.mark('emissions')
+            emitted = population.emitted_count()
+            if profiler:
+                profiler.mark('detections.scan')
+            found = process_detections(population, self.t_signal, profiler)
+
+        if profiler:
+            profiler.mark('arrivals')
+        arrived = fleet.land(self.time)
+        if len(arrived):
+            for target in fleet.target[arrived[self.owns(arrived)]].tolist():
+                self.visit(target)
+            fleet.release(arrived)
+
+        self.signals_emitted_count += emitted
+
+        if profiler:
+            profiler.mark('launches')
+        for listener, emitter in found:
+            self.find_count += 1
+            self.launch(listener, emitter)
+
+        if profiler:
+            profiler.mark(None)
+            profiler.count('died', len(dead))
+            profiler.count('ships_landed', len(arrived))
+            profiler.count('ships_launched', len(found))
+            profiler.count('ships_in_flight', fleet.count)
+        self.time += 1
+
+    def snapshot(self):
+        if self.recorder is not None:
+            self.recorder.flush()
+        state = copy.deepcopy({name: value for name, value in self.__dict__.items()
+                               if name not in ('observers', 'recorder', 'running', 'profiler')})
+        state['recorder_rows'] = None if self.recorder is None else self.recorder.rows
+        return state
+
+    @classmethod
+    def restore(cls, state, recorder=None):
+        state = dict(state)
+        recorder_rows = state.pop('recorder_rows')
+        simulation = cls.__new__(cls)
+        simulation.__dict__.update(state)
+        simulation.observers = []
+        simulation.running = False
+        simulation.profiler = None
+        simulation.recorder = recorder
+        if recorder is not None and recorder_rows is not None:
+            recorder.truncate(recorder_rows)
+        if simulation.threads:
+            numba.set_num_threads(min(simulation.threads, numba.config.NUMBA_NUM_THREADS))
+        return simulation
+
+    def subscribe(self, observer):
+        self.observers.append(observer)
+
+    def stop(self):
+        self.running = False
+
+    def notify(self):
+        profiler = self.profiler
+        if profiler:
+            profiler.mark('observers')
+        for observer in self.observers:
+            observer(self)
+        if profiler:
+            profiler.end()
+
+    def run(self, until=None):
+        until = self.stop_record if until is None else until
+        self.running = True
+        while self.running and self.time <= until:
+            self.step()
+            self.notify()
+        self.running = False
+
+    def slopes(self):
+        X_civ = self.times.reshape(-1, 1)
+        k_civ = np.linalg.lstsq(X_civ, self.civ_number, rcond=None)[0][0]
+        k_detected = np.linalg.lstsq(X_civ, self.detected_number, rcond=None)[0][0]
+        return k_civ, k_detected
+
+
+def warmup():
+    threads = numba.get_num_threads()
+    parameters = dict(n=20, radius=50, t_range=[6000, 100000], t_0_range=[0, 100000], t_intel_range=[4000, 6000],
+                      t_signal=3, t_stop=1000, spaceships_speed=0.5, start_record=0, stop_record=20, step=10)
+    for kernel_threads in (None, 1):
+        Simulation(**parameters, seed=0, threads=kernel_threads).run()
+    ship_course(0.0, 0.0, 1.0, 1.0, 0.5)
+    numba.set_num_threads(threads)
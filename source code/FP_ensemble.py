@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import argparse
+import math
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from FP_config import Config
+from FP_core import Simulation, warmup
+from FP_events import EventSimulation
+from FP_sweep import DEFAULTS, parse_values
+
+T_95 = [12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+        2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+        2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042]
+
+
+def run_member(parameters, seed, event_driven=True):
+    simulation_class = EventSimulation if event_driven else Simulation
+    simulation = simulation_class(**parameters, seed=seed)
+    simulation.run()
+    return simulation.slopes()
+
+
+def confidence_interval(values):
+    values = np.asarray(values, dtype=float)
+    mean = float(values.mean())
+    if len(values) < 2:
+        return mean, math.inf
+    t = T_95[len(values) - 2] if len(values) - 1 <= len(T_95) else 1.96
+    return mean, t * float(values.std(ddof=1)) / math.sqrt(len(values))
+
+
+def summarize(slopes, runs):
+    k_civ, k_detected = zip(*slopes)
+    k_civ_mean, k_civ_error = confidence_interval(k_civ)
+    k_detected_mean, k_detected_error = confidence_interval(k_detected)
+    return {
+        'done': len(slopes),
+        'runs': runs,
+        'k_civ': k_civ_mean,
+        'k_civ_error': k_civ_error,
+        'k_detected': k_detected_mean,
+        'k_detected_error': k_detected_error,
+    }
+
+
+def run_ensemble(parameters, runs, seed=None, workers=None, event_driven=True):
+    seeds = np.random.SeedSequence(seed).spawn(runs)
+    slopes = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=warmup) as executor:
+        futures = {executor.submit(run_member, parameters, child, event_driven): member
+                   for member, child in enumerate(seeds)}
+        for future in as_completed(futures):
+            slopes[futures[future]] = future.result()
+            yield summarize([slopes[member] for member in sorted(slopes)], runs)
+
+
+def format_summary(summary):
+    line = (f"Запусков: {summary['done']}/{summary['runs']} | "
+            f"k_civ = {summary['k_civ']:.6f} ± {summary['k_civ_error']:.6f} | "
+            f"k_detected = {summary['k_detected']:.6f} ± {summary['k_detected_error']:.6f}")
+    if summary['k_detected'] > 0:
+        line += f" | обнаружение раз в {1 / summary['k_detected']:.4f} тыс. лет"
+    return line
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Серия независимых симуляций с разными зернами")
+    parser.add_argument("--set", action="append", default=[], metavar="ИМЯ=ЗНАЧ",
+                        help="значение параметра симуляции, например N=1000")
+    parser.add_argument("--runs", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--ticks", action="store_true", help="пошаговый режим вместо событийного")
+    args = parser.parse_args()
+
+    values = {}
+    for item in args.set:
+        name, value = item.split("=", 1)
+        if name not in DEFAULTS:
+            parser.error(f"неизвестный параметр: {name}")
+        parsed = parse_values(value)
+        if len(parsed) != 1:
+            parser.error(f"{name}: нужно одно значение, для перебора используйте FP_sweep.py")
+        values[name] = parsed[0]
+    try:
+        config = Config.from_dict(values)
+    except ValueError as e:
+        parser.error(str(e))
+
+    seed = args.seed
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+        print(f"Зерно: {seed} (повторить серию: --seed {seed})", flush=True)
+    for summary in run_ensemble(config.simulation_parameters(), args.runs, seed, args.workers, not args.ticks):
+        print(format_summary(summary), flush=True)
+
+
+if __name__ == "__main__":
+    main()
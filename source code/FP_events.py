@@ -0,0 +1,179 @@
+import heapq
+import numpy as np
+from FP_core import Simulation, ship_course
+
+DEATH = 0
+INTEL = 1
+ARRIVAL = 2
+DETECTION = 3
+
+
+class EventSimulation(Simulation):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        population = self.population
+        self.window = min(self.t_signal, self.t_stop)
+        self.generation = population.generation
+        self.t_death = np.zeros(population.n, dtype=np.int64)
+        self.t_signal_start = np.zeros(population.n, dtype=np.int64)
+        self.events = []
+        self.sequence = 0
+        self.schedule_lives(np.arange(population.n))
+
+    def push(self, tick, kind, payload):
+        heapq.heappush(self.events, (tick, kind, self.sequence, payload))
+        self.sequence += 1
+
+    def schedule_lives(self, slots):
+        population = self.population
+        self.t_death[slots] = population.t_start[slots] + population.t_end[slots] - population.t_0[slots] + 1
+        self.t_signal_start[slots] = population.t_start[slots] + population.t_intel[slots] - population.t_0[slots] + 1
+        for slot in slots.tolist():
+            generation = self.generation[slot]
+            self.push(self.t_death[slot], DEATH, (slot, generation))
+            if population.intel[slot] and self.t_stop >= 1 and self.t_signal_start[slot] < self.t_death[slot]:
+                self.push(self.t_signal_start[slot], INTEL, (slot, generation))
+
+    def signal_radius(self, slot):
+        return max(0, self.time - self.t_signal_start[slot] + 1)
+
+    def valid(self, slot, generation):
+        return self.generation[slot] == generation
+
+    def schedule_detections(self, starters):
+        population = self.population
+        time = self.time
+        started = (population.intel & (self.t_signal_start <= time)
+                   & (self.t_signal_start + self.t_stop - 1 >= time))
+        started_ticks = self.t_signal_start
+        for a in starters:
+            candidates = started.copy()
+            candidates[a] = False
+            candidates &= (started_ticks < time) | (np.arange(population.n) < a)
+            others = np.flatnonzero(candidates)
+            if self.profiler:
+                self.profiler.count('pairs_tested', len(others))
+            if len(others) == 0:
+                continue
+            distance = np.sqrt((population.x[others] - population.x[a]) ** 2
+                               + (population.y[others] - population.y[a]) ** 2)
+            alive_until = np.minimum(self.t_death[others], self.t_death[a])
+
+            a_detects = np.full(len(others), -1, dtype=np.int64)
+            for offset in range(self.window):
+                tick = time + offset
+                radius = tick - started_ticks[others] + 1
+                hit = ((a_detects < 0) & (tick < alive_until) & (radius <= self.t_stop)
+                       & (distance <= radius) & (distance >= np.maximum(0, radius - self.t_signal)))
+                a_detects[hit] = tick
+
+            b_detects = np.full(len(others), -1, dtype=np.int64)
+            for offset in range(self.window):
+                tick = time + offset
+                radius = offset + 1
+                hit = ((b_detects < 0) & (tick < alive_until) & (tick - started_ticks[others] + 1 <= self.window)
+                       & (distance <= radius) & (distance >= max(0, radius - self.t_signal)))
+                b_detects[hit] = tick
+
+            a_generation = self.generation[a]
+            for b, tick in zip(others[a_detects >= 0].tolist(), a_detects[a_detects >= 0].tolist()):
+                self.push(tick, DETECTION, (a, a_generation, b, self.generation[b]))
+            for b, tick in zip(others[b_detects >= 0].tolist(), b_detects[b_detects >= 0].tolist()):
+                self.push(tick, DETECTION, (b, self.generation[b], a, a_generation))
+
+    def travel_time(self, listener, emitter):
+        population = self.population
+        return ship_course(population.x[listener], population.y[listener],
+                           population.x[emitter], population.y[emitter], self.fleet.speed)[2]
+
+    def pop_events(self, buckets):
+        while self.events and self.events[0][0] == self.time:
+            _, kind, _, payload = heapq.heappop(self.events)
+            buckets[kind].append(payload)
+
+    def metrics(self):
+        population = self.population
+        time = self.time
+        active = population.intel & (self.t_signal_start < time) & (time <= self.t_signal_start + self.t_stop)
+        ships = sum(1 for _, kind, _, payload in self.events if kind == ARRIVAL and self.valid(*payload[:2]))
+        return (time, population.n, self.signals_emitted_count, self.find_count, int(np.count_nonzero(active)),
+                ships, self.visit_count, self.contact_count, self.missed_visit_count)
+
+    def record_until(self, time):
+        while self.next_record() <= time:
+            self.time = self.next_record()
+            self.record()
+        self.time = time
+
+    def step(self):
+        time = self.time
+        profiler = self.profiler
+        if profiler:
+            profiler.begin(time)
+            profiler.mark('record')
+        self.record_until(time)
+        if profiler:
+            profiler.mark('events')
+        buckets = ([], [], [], [])
+        self.pop_events(buckets)
+
+        if profiler:
+            profiler.mark('births')
+        population = self.population
+        dead = np.array(sorted(slot for slot, generation in buckets[DEATH] if self.valid(slot, generation)),
+                        dtype=np.int64)
+        if len(dead):
+            population.remove(dead)
+            population.spawn(dead, time)
+            self.schedule_lives(dead)
+
+        if profiler:
+            profiler.mark('arrivals')
+        for slot, generation, target in buckets[ARRIVAL]:
+            if self.valid(slot, generation):
+                self.visit(target)
+
+        if profiler:
+            profiler.mark('detections.schedule')
+        starters = [slot for slot, generation in buckets[INTEL] if self.valid(slot, generation)]
+        self.signals_emitted_count += len(starters)
+        self.schedule_detections(starters)
+        self.pop_events(buckets)
+
+        if profiler:
+            profiler.mark('detections.accept')
+            profiler.count('detection_events', len(buckets[DETECTION]))
+        detections = population.detections
+        found = []
+        for listener, listener_generation, emitter, emitter_generation in buckets[DETECTION]:
+            if (self.valid(listener, listener_generation) and self.valid(emitter, emitter_generation)
+                    and (population.id(listener), population.id(emitter)) not in detections):
+                found.append((listener, emitter))
+        for listener, emitter in found:
+            detections.add(population.id(listener), population.id(emitter))
+            population.detected_others[listener] = True
+            population.was_detected[emitter] = True
+            self.find_count += 1
+            ticks = self.travel_time(listener, emitter)
+            if ticks > 0:
+                self.push(time + ticks, ARRIVAL, (listener, self.generation[listener], population.id(emitter)))
+
+        if profiler:
+            profiler.mark(None)
+            profiler.count('died', len(dead))
+            profiler.count('ships_landed', len(buckets[ARRIVAL]))
+            profiler.count('ships_launched', len(found))
+            profiler.count('events', sum(len(bucket) for bucket in buckets))
+        self.time += 1
+
+    def run(self, until=None):
+        until = self.stop_record if until is None else until
+        self.running = True
+        while self.running and self.events and self.events[0][0] <= until:
+            self.time = self.events[0][0]
+            self.step()
+            self.notify()
+        if self.running:
+            self.record_until(until)
+            self.time = until + 1
+        self.running = False
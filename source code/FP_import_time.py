@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import argparse
+import json
+import subprocess
+
+ENGINE_HEAVY = ['pygame', 'matplotlib', 'PyQt6']
+GUI_HEAVY = ['pygame', 'matplotlib', 'numpy', 'numba']
+MODULES = {'FP_config': ENGINE_HEAVY, 'FP_core': ENGINE_HEAVY, 'FP_events': ENGINE_HEAVY, 'FP_logic': ENGINE_HEAVY,
+           'FP_worker': ENGINE_HEAVY, 'FP_ensemble': ENGINE_HEAVY, 'FP_sweep': ENGINE_HEAVY,
+           'FP_main_Linux': GUI_HEAVY, 'FP_main_Windows': GUI_HEAVY}
+
+PROBE = """
+import sys, json, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps([elapsed, sorted(name for name in {heavy!r} if name in sys.modules)]))
+"""
+
+
+def measure(module, repeat=3):
+    directory = os.path.dirname(os.path.abspath(__file__))
+    best = None
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", PROBE.format(module=module, heavy=MODULES[module])],
+                                cwd=directory, capture_output=True, text=True, check=True).stdout
+        elapsed, loaded = json.loads(output.strip().splitlines()[-1])
+        best = elapsed if best is None else min(best, elapsed)
+    return {'module': module, 'seconds': best, 'heavy': loaded}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Время импорта модулей симуляции в чистом процессе")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--limit", type=float, default=None, help="допустимое время импорта, с")
+    parser.add_argument("--json", help="сохранить результаты в JSON-файл")
+    args = parser.parse_args()
+
+    results = [measure(module, args.repeat) for module in MODULES]
+    failed = False
+    for result in results:
+        line = f"{result['module']:<16} {result['seconds'] * 1000:8.1f} мс"
+        if result['heavy']:
+            line += f"  загружены: {', '.join(result['heavy'])}"
+            failed = True
+        if args.limit is not None and result['seconds'] > args.limit:
+            line += "  превышен лимит"
+            failed = True
+        print(line)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=1)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
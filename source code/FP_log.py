@@ -0,0 +1,71 @@
+import queue
+import threading
+import collections
+from FP_protocol import METRICS, encode
+from FP_profile import format_summary
+
+LABELS = {'population': "цивилизации", 'signals': "сигналы", 'detections': "обнаружения",
+          'active_signals': "активные сигналы", 'ships': "корабли", 'visits': "визиты", 'contacts': "контакты",
+          'missed_visits': "пустые визиты"}
+
+
+def format_message(message, job=None):
+    prefix = f"[{job}] " if job is not None else ""
+    msg_type = message.get('type')
+    if msg_type == "progress":
+        line = f"{message['time']} тыс. лет ({message['percent']}%)"
+        values = [f"{LABELS[name]} {message[name]}" for name in METRICS[1:] if name in message]
+        return prefix + (line + ": " + ", ".join(values) if values else line)
+    if msg_type == "result":
+        return prefix + "\n".join(message['report'])
+    if msg_type == "error":
+        return prefix + message['message']
+    if msg_type == "finished":
+        return prefix + "Симуляция завершена"
+    if msg_type == "profile":
+        return prefix + f"{message['time']} тыс. лет. " + format_summary(message)
+    if msg_type == "text":
+        return prefix + message['text']
+    return prefix + encode(message)
+
+
+class LogBuffer:
+    def __init__(self, max_lines=5000, formatter=format_message):
+        self.formatter = formatter
+        self.lines = collections.deque(maxlen=max_lines)
+        self.dropped = 0
+        self.lock = threading.Lock()
+        self.queue = queue.SimpleQueue()
+        self.thread = threading.Thread(target=self.format_loop, daemon=True)
+        self.thread.start()
+
+    def put(self, message, job=None):
+        self.queue.put((message, job))
+
+    def write(self, text, job=None):
+        self.put({'type': 'text', 'text': text}, job)
+
+    def format_loop(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            line = self.formatter(*item)
+            with self.lock:
+                if len(self.lines) == self.lines.maxlen:
+                    self.dropped += 1
+                self.lines.append(line)
+
+    def drain(self):
+        with self.lock:
+            lines = list(self.lines)
+            dropped = self.dropped
+            self.lines.clear()
+            self.dropped = 0
+        if dropped:
+            lines.insert(0, f"... пропущено строк: {dropped}")
+        return "\n".join(lines)
+
+    def close(self):
+        self.queue.put(None)
+        self.thread.join(timeout=1)
@@ -2,309 +2,104 @@
 # -*- coding: utf-8 -*-
 
 import os
-
-os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'
-import pygame
-import random
-import math
+import sys
 import numpy as np
-import matplotlib.pyplot as plt
-from numba import njit
-
-N = 500
-R = 400
-Disp = 900
-A = 1000
-t_range = [int(6000000 / A), int(100000000 / A)]
-t_0_range = [int(0 / A), int(100000000 / A)]
-t_intel_range = [int(4000000 / A), int(6000000 / A)]
-t_signal = 3
-t_stop = 1000
-spaceships_speed = 0.5
-
-start_record = 0
-stop_record = 100000
-step = 1000
-arrays_size = int(stop_record / step + 1)
-
-BLACK = (0, 0, 0)
-WHITE = (255, 255, 255)
-BLUE = (0, 0, 255)
-RED = (255, 0, 0)
-GREEN = (0, 255, 0)
-YELLOW = (255, 255, 0)
-GRAY = (128, 128, 128)
-
-
-@njit(fastmath=True)
-def generate_random_point_in_circle(radius):
-    while True:
-        x = random.uniform(Disp / 2 - R - radius, Disp / 2 - R + radius)
-        y = random.uniform(Disp / 2 - R - radius, Disp / 2 - R + radius)
-        if math.sqrt((Disp / 2 - R - x) ** 2 + (Disp / 2 - R - y) ** 2) <= radius:
-            return x, y
-
-
-@njit(fastmath=True)
-def calculate_distance(x1, y1, x2, y2):
-    return math.sqrt((x2 - x1) ** 2 + (y2 - y1) ** 2)
-
-
-@njit(fastmath=True)
-def normalize_vector(x, y, distance):
-    if distance > 0:
-        return x / distance, y / distance
-    return 0.0, 0.0
-
-
-class Spaceship:
-    def __init__(self, start_x, start_y, target_x, target_y, speed=spaceships_speed):
-        self.x = start_x
-        self.y = start_y
-        self.target_x = target_x
-        self.target_y = target_y
-        self.speed = speed
-        self.active = True
-        self.distance = calculate_distance(start_x, start_y, target_x, target_y)
-        self.traveled = 0
-        self.direction_x, self.direction_y = normalize_vector(target_x - start_x, target_y - start_y, self.distance)
-        self.animation_frame = 0
-        self.animation_speed = 5
-        self.animation_counter = 0
-        self.glider_patterns = [
-            [(-1, 0), (0, -1), (0, -2), (-1, -2), (-2, -2)],
-            [(-2, 0), (0, 0), (0, -1), (-1, -1), (-1, -2)],
-            [(-2, -1), (-1, -2), (0, 0), (0, -1), (0, -2)],
-            [(-2, 0), (-2, -2), (-1, -2), (-1, -1), (0, -1)]
-        ]
-
-    def update(self):
-        if self.active:
-            self.x += self.direction_x * self.speed
-            self.y += self.direction_y * self.speed
-            self.traveled += self.speed
-            self.animation_counter += 1
-            if self.animation_counter >= self.animation_speed:
-                self.animation_counter = 0
-                self.animation_frame = (self.animation_frame + 1) % 4
-            current_distance = calculate_distance(self.x, self.y, self.target_x, self.target_y)
-            if current_distance <= self.speed:
-                self.active = False
-                return True
-        return False
-
-    def draw(self, screen):
-        if self.active:
-            angle = math.atan2(self.direction_y, self.direction_x)
-            pattern = self.glider_patterns[self.animation_frame]
-            for dx, dy in pattern:
-                rotated_x = dx * math.cos(angle) - dy * math.sin(angle)
-                rotated_y = dx * math.sin(angle) + dy * math.cos(angle)
-                cell_size = 2
-                pygame.draw.rect(screen, YELLOW,
-                                 (int(self.x + R + rotated_x * cell_size - cell_size / 2),
-                                  int(self.y + R + rotated_y * cell_size - cell_size / 2),
-                                  cell_size, cell_size))
-
-
-class Civilization:
-    def __init__(self, x, y, t_0, time):
-        self.x = x
-        self.y = y
-        self.t_0 = t_0
-        self.t_intel = random.randint(*t_intel_range)
-        self.t_start = time
-        self.t_end = random.randint(*t_range)
-        self.t = t_0
-        self.signal_radius = 0
-        self.signal_active = False
-        self.signals_emitted = 0
-        self.detected_civs = []
-        self.was_detected = False
-        self.detected_others = False
-        self.spaceships = []
-
-    def update(self, time):
-        self.t = self.t_0 + time - self.t_start
-        if self.t > self.t_intel and not self.signal_active:
-            self.signal_active = True
-        if self.signal_active:
-            self.signal_radius += 1
-            if self.signal_radius > t_stop:
-                self.signal_active = False
-        for spaceship in self.spaceships[:]:
-            if spaceship.update():
-                self.spaceships.remove(spaceship)
-                return spaceship
-        return None
-
-    def send_spaceship(self, target_civ):
-        spaceship = Spaceship(self.x, self.y, target_civ.x, target_civ.y)
-        self.spaceships.append(spaceship)
-        return spaceship
-
-    def draw(self, screen):
-        point_color = GREEN if self.was_detected else WHITE
-        pygame.draw.circle(screen, point_color, (int(self.x + R), int(self.y + R)), 2)
-        if self.detected_others:
-            pygame.draw.circle(screen, BLUE, (int(self.x + R), int(self.y + R)), 4, 2)
-        if self.signal_active and self.t_intel > self.t_0:
-            pygame.draw.circle(screen, RED, (int(self.x + R), int(self.y + R)), self.signal_radius, t_signal)
-        for spaceship in self.spaceships:
-            spaceship.draw(screen)
-
-
-@njit(fastmath=True)
-def check_detection_conditions(distance, outer_edge, inner_edge, signal_active):
-    return distance <= outer_edge and distance >= inner_edge and signal_active
-
-
-def process_detections(civilizations):
-    global find_count
-    n = len(civilizations)
-    for i in range(n):
-        civ1 = civilizations[i]
-        for j in range(i + 1, n):
-            civ2 = civilizations[j]
-            if (civ2 not in getattr(civ1, 'detected_civs', [])) and (civ1 not in getattr(civ2, 'detected_civs', [])):
-                if (civ1.signal_active and civ2.signal_active and civ1.t_intel > civ1.t_0 and civ2.t_intel > civ2.t_0):
-                    distance = calculate_distance(civ1.x, civ1.y, civ2.x, civ2.y)
-                    outer_edge_1 = civ1.signal_radius
-                    inner_edge_1 = max(0, civ1.signal_radius - t_signal)
-                    outer_edge_2 = civ2.signal_radius
-                    inner_edge_2 = max(0, civ2.signal_radius - t_signal)
-                    detection_1 = check_detection_conditions(distance, outer_edge_2, inner_edge_2,
-                                                             civ1.signal_radius <= t_signal)
-                    detection_2 = check_detection_conditions(distance, outer_edge_1, inner_edge_1,
-                                                             civ2.signal_radius <= t_signal)
-                    if detection_1:
-                        find_count += 1
-                        civ1.detected_civs.append(civ2)
-                        civ1.detected_others = True
-                        civ2.was_detected = True
-                        civ1.send_spaceship(civ2)
-                    if detection_2:
-                        find_count += 1
-                        civ2.detected_civs.append(civ1)
-                        civ2.detected_others = True
-                        civ1.was_detected = True
-                        civ2.send_spaceship(civ1)
-
-def main():
-    global find_count, signals_emitted_count, contact_count, visit_count
-    global times, civ_number, detected_number, next_step, array_count
-
-    find_count = 0
-    signals_emitted_count = 0
-    contact_count = 0
-    visit_count = 0
-
-    times = np.zeros(arrays_size)
-    civ_number = np.zeros(arrays_size)
-    detected_number = np.zeros(arrays_size)
-    next_step = start_record
-    array_count = 0
-
-    pygame.init()
-    screen = pygame.display.set_mode((Disp, Disp))
-    pygame.display.set_caption("Симуляция парадокса Ферми")
-    clock = pygame.time.Clock()
-
-    civilizations = []
-    for _ in range(10 * N):
-        x, y = generate_random_point_in_circle(R)
-        civilizations.append(Civilization(x, y, random.randint(*t_0_range), 0))
-
-    running = True
-    time = 0
-    while running:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-
-        civilizations = [civ for civ in civilizations if civ.t < civ.t_end]
-        if time == 0:
-            civilizations = civilizations[:N]
-
-        if time == next_step and time <= stop_record:
-            times[array_count] = time
-            civ_number[array_count] = signals_emitted_count
-            detected_number[array_count] = find_count
-            array_count += 1
-            next_step += step
-
-        if len(civilizations) < N:
-            while len(civilizations) - N < 0:
-                x, y = generate_random_point_in_circle(R)
-                civilizations.append(Civilization(x, y, 0, time))
-
-        arrived_spaceships = []
-        for civilization in civilizations:
-            arrived_ship = civilization.update(time)
-            if arrived_ship:
-                arrived_spaceships.append((civilization, arrived_ship))
-
-        for civ, spaceship in arrived_spaceships:
-            for target_civ in civilizations:
-                if (abs(target_civ.x - spaceship.target_x) < 1 and abs(target_civ.y - spaceship.target_y) < 1):
-                    if target_civ.signal_radius <= t_signal and target_civ.t_intel > target_civ.t_0:
-                        contact_count += 1
-                        visit_count += 1
-                    else:
-                        visit_count += 1
-                    break
-
-        for k in range(len(civilizations)):
-            civ3 = civilizations[k]
-            if civ3.signal_active and civ3.signal_radius == 1 and civ3.t_intel > civ3.t_0:
-                signals_emitted_count += 1
-
-        process_detections(civilizations)
-
-        screen.fill(BLACK)
-        for civilization in civilizations:
-            civilization.draw(screen)
-
-        font = pygame.font.Font(None, 36)
-        text = font.render(f"Обнаружения: {find_count}", True, WHITE)
-        screen.blit(text, (10, 60))
-        text = font.render(f"Сигналы: {signals_emitted_count}", True, WHITE)
-        screen.blit(text, (10, 110))
-        text = font.render(f"Контакты: {contact_count}", True, WHITE)
-        screen.blit(text, (10, Disp - 40))
-        text = font.render(f"Визиты: {visit_count}", True, WHITE)
-        screen.blit(text, (10, Disp - 90))
-        text = font.render(f"Время: {time} тыс. лет", True, WHITE)
-        screen.blit(text, (10, 10))
-
-        font2 = pygame.font.Font(None, 30)
-        if time < stop_record:
-            progress_percent = int((time / stop_record) * 100)
-            record_text = f"идет запись данных: {progress_percent}%"
+from FP_config import Config
+from FP_core import Simulation, warmup
+from FP_events import EventSimulation
+from FP_recorder import Recorder
+from FP_checkpoint import Checkpointer, load_checkpoint
+from FP_protocol import ProgressReporter, result_message, emit
+from FP_shared import SharedState, SharedPublisher
+from FP_profile import Profiler, ProfileReporter, format_summary
+
+
+def run(config, observers=(), profiler=None):
+    simulation_class = EventSimulation if config.event_driven else Simulation
+    resume = config.resume and os.path.exists(config.checkpoint_path)
+    recorder = Recorder(config.metrics_path, append=resume) if config.metrics_path else None
+    if resume:
+        simulation = load_checkpoint(config.checkpoint_path, recorder)
+    else:
+        seed = config.seed if config.seed >= 0 else None
+        simulation = simulation_class(**config.simulation_parameters(), seed=seed, threads=config.threads,
+                                      recorder=recorder)
+    checkpointer = None
+    if config.checkpoint_path:
+        checkpointer = Checkpointer(config.checkpoint_path, config.checkpoint_interval)
+        simulation.subscribe(checkpointer)
+    publisher = None
+    if config.shared_memory:
+        publisher = SharedPublisher(SharedState(config.shared_memory))
+        simulation.subscribe(publisher)
+    simulation.profiler = profiler
+    for observer in observers:
+        simulation.subscribe(observer)
+
+    view = None
+    try:
+        if config.headless or config.event_driven:
+            simulation.run()
         else:
-            record_text = "данные симуляции записаны"
-        text = font2.render(record_text, True, GRAY)
-        text_rect = text.get_rect(center=(screen.get_width() // 2, Disp - 25))
-        screen.blit(text, text_rect)
+            from FP_view import PygameView
+            view = PygameView(config.Disp, config.t_signal, config.stop_record, config.FPS, config.speed)
+            simulation.subscribe(view)
+            simulation.run(until=float('inf'))
+    finally:
+        if view is not None:
+            view.close()
+        if checkpointer is not None:
+            checkpointer.close(simulation)
+        if publisher is not None:
+            publisher.finish(simulation)
+            publisher.state.close()
+        if recorder is not None:
+            recorder.close()
+
+    k_civ, k_detected = simulation.slopes()
+    results = {
+        'time': simulation.time - 1,
+        'recorded': simulation.array_count,
+        'times': simulation.times,
+        'civ_number': simulation.civ_number,
+        'detected_number': simulation.detected_number,
+        'k_civ': float(k_civ),
+        'k_detected': float(k_detected),
+        'find_count': simulation.find_count,
+        'signals_emitted_count': simulation.signals_emitted_count,
+        'contact_count': simulation.contact_count,
+        'visit_count': simulation.visit_count,
+        'missed_visit_count': simulation.missed_visit_count,
+        'seed': simulation.population.random.entropy,
+    }
+    if profiler is not None:
+        results['profile'] = profiler.summary()
+    return results
+
+
+def report(results):
+    k_civ = results['k_civ']
+    k_detected = results['k_detected']
+    if k_detected * k_civ != 0:
+        return [f"Обнаружение одной цивилизации происходит раз в {1 / k_detected:.4f} тыс. лет",
+                f"Число цивилизаций, появившихся и исчезнувших за это время: {k_civ / k_detected:.4f}",
+                f"Средняя доля обнаружений на одну цивилизацию: {float(k_detected / k_civ):.4f}"]
+    return ["За рассматриваемый диапазон времени симуляции обнаружений не произошло"]
 
-        pygame.display.flip()
-        clock.tick(100)
-        time += 1
 
+def save_results(results, path="simulation_results.npz"):
+    np.savez(path, times=results['times'], civ_number=results['civ_number'],
+             detected_number=results['detected_number'])
 
-    pygame.display.quit()
-    pygame.quit()
 
-    X_civ = times.reshape(-1, 1)
-    k_civ = np.linalg.lstsq(X_civ, civ_number, rcond=None)[0][0]
-    k_detected = np.linalg.lstsq(X_civ, detected_number, rcond=None)[0][0]
+def plot_results(results):
+    import matplotlib.pyplot as plt
 
-    if k_detected * k_civ != 0:
-        print(f"Обнаружение одной цивилизации происходит раз в {1 / k_detected:.4f} тыс. лет")
-        print(f"Число цивилизаций, появившихся и исчезнувших за это время: {k_civ / k_detected:.4f}")
-        print(f"Средняя доля обнаружений на одну цивилизацию: {float(k_detected / k_civ):.4f}")
-    else:
-        print("За рассматриваемый диапазон времени симуляции обнаружений не произошло")
+    times = results['times']
+    civ_number = results['civ_number']
+    detected_number = results['detected_number']
+    k_civ = results['k_civ']
+    k_detected = results['k_detected']
 
     fig, axes = plt.subplots(2, 1, figsize=(10, 8))
     fig.canvas.manager.set_window_title("Отображение полученных данных")
@@ -326,5 +121,55 @@ def main():
     plt.tight_layout()
     plt.show()
 
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--warmup":
+        warmup()
+        print("Ядро симуляции скомпилировано и сохранено в кэш numba")
+        return
+
+    config = Config()
+    if "--headless" in sys.argv:
+        config.headless = True
+    if "--max-speed" in sys.argv:
+        config.speed = 0
+    if "--metrics" in sys.argv[:-1]:
+        config.metrics_path = sys.argv[sys.argv.index("--metrics") + 1]
+    if "--checkpoint" in sys.argv[:-1]:
+        config.checkpoint_path = sys.argv[sys.argv.index("--checkpoint") + 1]
+    if "--resume" in sys.argv:
+        config.resume = True
+    if "--seed" in sys.argv[:-1]:
+        config.seed = int(sys.argv[sys.argv.index("--seed") + 1])
+    if "--profile" in sys.argv[:-1]:
+        config.profile_sample = int(sys.argv[sys.argv.index("--profile") + 1])
+
+    observers = []
+    profiler = Profiler(config.profile_sample) if config.profile_sample > 0 else None
+    if "--json" in sys.argv:
+        send = emit
+        observers.append(ProgressReporter(emit))
+    else:
+        def send(message):
+            print(format_summary(message), file=sys.stderr, flush=True)
+    if profiler is not None:
+        observers.append(ProfileReporter(profiler, send))
+
+    results = run(config, observers=observers, profiler=profiler)
+    for observer in observers:
+        observer.finish(results)
+    if "--json" in sys.argv:
+        emit(result_message(results, report(results)))
+    else:
+        for line in report(results):
+            print(line)
+        print(f"Зерно генератора: {results['seed']}")
+
+    if config.headless:
+        save_results(results, config.results_path)
+    else:
+        plot_results(results)
+
+
 if __name__ == "__main__":
     main()
@@ -1,63 +1,16 @@
 import os
 import sys
-import subprocess
-import threading
+import time
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                              QHBoxLayout, QPushButton, QLabel, QLineEdit,
-                             QGroupBox, QTextEdit, QScrollArea, QSplitter)
+                             QGroupBox, QTextEdit, QScrollArea, QSplitter, QProgressBar,
+                             QTableWidget, QTableWidgetItem, QHeaderView, QSpinBox, QAbstractItemView,
+                             QPlainTextEdit, QCheckBox)
 from PyQt6.QtGui import QPalette, QColor, QPixmap
-from PyQt6.QtCore import Qt, pyqtSignal, QObject
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-import numpy as np
-
-
-class SimulationWorker(QObject):
-    finished = pyqtSignal()
-    output_received = pyqtSignal(str)
-    error_occurred = pyqtSignal(str)
-    progress_updated = pyqtSignal(int)
-
-    def __init__(self, script_content):
-        super().__init__()
-        self.script_content = script_content
-        self.is_running = False
-
-    def run_simulation(self):
-        self.is_running = True
-
-        with open("temp_simulation.py", "w", encoding="utf-8") as f:
-            f.write(self.script_content)
-
-        self.output_received.emit("Симуляция запущена...")
-
-        process = subprocess.Popen([sys.executable, "temp_simulation.py"],
-                                   stdout=subprocess.PIPE,
-                                   stderr=subprocess.PIPE,
-                                   text=True,
-                                   bufsize=1,
-                                   universal_newlines=True)
-
-        while self.is_running:
-            output = process.stdout.readline()
-            if output == '' and process.poll() is not None:
-                break
-            if output:
-                self.output_received.emit(output.strip())
-
-        stdout, stderr = process.communicate()
-
-        if process.returncode == 0:
-            self.output_received.emit("Симуляция завершена успешно!")
-            self.output_received.emit(stdout)
-        else:
-            self.error_occurred.emit(f"Ошибка при выполнении симуляции:\n{stderr}")
-
-        self.is_running = False
-        self.finished.emit()
-
-    def stop(self):
-        self.is_running = False
+from PyQt6.QtCore import Qt, QTimer
+from FP_config import Config, RUN_OPTIONS
+from FP_worker import JobPool
+from FP_log import LogBuffer
 
 
 class ParameterWindow(QMainWindow):
@@ -65,12 +18,23 @@ class ParameterWindow(QMainWindow):
         super().__init__()
         self.setWindowTitle("Настройки")
         self.setGeometry(100, 100, 1400, 800)
-        self.simulation_thread = None
-        self.simulation_worker = None
+        self.pool = JobPool()
+        self.jobs = {}
+        self.job_count = 0
+        self.results_windows = {}
+        self.log = LogBuffer()
         self.initUI()
         self.center()
         self.apply_styles()
 
+        self.log_timer = QTimer(self)
+        self.log_timer.timeout.connect(self.flush_log)
+        self.log_timer.start(200)
+
+        self.poll_timer = QTimer(self)
+        self.poll_timer.timeout.connect(self.poll_jobs)
+        self.poll_timer.start(50)
+
     def center(self):
         screen = QApplication.primaryScreen()
         screen_geometry = screen.geometry()
@@ -139,7 +103,7 @@ class ParameterWindow(QMainWindow):
                         background-color: #555;
                         color: #888;
                     }
-                    QTextEdit {
+                    QTextEdit, QPlainTextEdit {
                         background-color: #424242;
                         border: 1px solid #555;
                         border-radius: 4px;
@@ -174,7 +138,8 @@ class ParameterWindow(QMainWindow):
             ("spaceships_speed", "Скорость кораблей в долях от скорости света", "0.5"),
             ("t_signal", "Время генерации сигнала (тыс. лет)", "3"),
             ("t_stop", "Время существования сигнала (тыс. лет)", "1000"),
-            ("FPS", "Максимальная величина FPS", "100")
+            ("FPS", "Максимальная величина FPS", "100"),
+            ("speed", "Скорость симуляции (тыс. лет в секунду, 0 - максимальная)", "100")
         ]
 
         for param_name, label_text, default_value in main_parameters:
@@ -274,6 +239,7 @@ class ParameterWindow(QMainWindow):
 
         scroll_area.setWidget(scroll_content)
         splitter.addWidget(scroll_area)
+        splitter.addWidget(self.init_jobs())
 
         results_widget = QWidget()
         results_layout = QVBoxLayout(results_widget)
@@ -283,14 +249,18 @@ class ParameterWindow(QMainWindow):
         results_label.setStyleSheet("font-size: 18px; font-weight: bold; color: #4fc3f7; padding: 13px;")
         results_layout.addWidget(results_label)
 
-        self.results_text = QTextEdit()
+        self.results_text = QPlainTextEdit()
         self.results_text.setReadOnly(True)
+        self.results_text.setMaximumBlockCount(5000)
         self.results_text.setPlaceholderText("Результаты симуляции появятся здесь после завершения...")
         self.results_text.setStyleSheet("font-size: 15px;")
         results_layout.addWidget(self.results_text)
 
+        self.verbose_box = QCheckBox("Подробный журнал (ход каждой симуляции)")
+        results_layout.addWidget(self.verbose_box)
+
         splitter.addWidget(results_widget)
-        splitter.setSizes([800, 250])
+        splitter.setSizes([600, 250, 200])
 
         main_layout.addWidget(splitter)
 
@@ -298,110 +268,177 @@ class ParameterWindow(QMainWindow):
         self.run_button.clicked.connect(self.run_simulation)
         main_layout.addWidget(self.run_button)
 
-    def run_simulation(self):
-        self.results_text.clear()
-        self.run_button.setEnabled(False)
-
+    def init_jobs(self):
+        jobs_group = QGroupBox("Очередь симуляций")
+        jobs_layout = QVBoxLayout()
+
+        self.jobs_table = QTableWidget(0, 5)
+        self.jobs_table.setHorizontalHeaderLabels(["№", "Параметры", "Состояние", "Прогресс",
+                                                   "Скорость, тыс. лет/с"])
+        self.jobs_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        self.jobs_table.verticalHeader().setVisible(False)
+        self.jobs_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.jobs_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        jobs_layout.addWidget(self.jobs_table)
+
+        controls_layout = QHBoxLayout()
+        controls_layout.addWidget(QLabel("Параллельных процессов"))
+        self.workers_box = QSpinBox()
+        self.workers_box.setRange(1, max(1, 4 * (os.cpu_count() or 1)))
+        self.workers_box.setValue(self.pool.workers)
+        self.workers_box.valueChanged.connect(self.pool.resize)
+        controls_layout.addWidget(self.workers_box)
+        self.profile_box = QCheckBox("Профилировать шаги")
+        controls_layout.addWidget(self.profile_box)
+        controls_layout.addStretch()
+
+        self.queue_button = QPushButton("Добавить в очередь без отрисовки")
+        self.queue_button.clicked.connect(self.queue_simulation)
+        controls_layout.addWidget(self.queue_button)
+        self.cancel_button = QPushButton("Отменить выбранные")
+        self.cancel_button.clicked.connect(self.cancel_selected)
+        controls_layout.addWidget(self.cancel_button)
+        jobs_layout.addLayout(controls_layout)
+
+        jobs_group.setLayout(jobs_layout)
+        return jobs_group
+
+    def read_config(self):
         params = {key: widget.text() for key, widget in self.params.items()}
-        script_content = self.generate_script(params)
-
-        self.simulation_worker = SimulationWorker(script_content)
-        self.simulation_thread = threading.Thread(target=self.simulation_worker.run_simulation)
-
-        self.simulation_worker.output_received.connect(self.handle_output)
-        self.simulation_worker.finished.connect(self.on_simulation_finished)
+        try:
+            config = Config.from_dict(params)
+        except ValueError as e:
+            self.log.write(f"Некорректные параметры: {e}")
+            return None
+        config.show_plot = False
+        if self.profile_box.isChecked():
+            config.profile_sample = 10
+        return config
+
+    def describe(self, config):
+        defaults = Config().to_dict()
+        changed = [f"{name}={value}" for name, value in config.to_dict().items()
+                   if name not in RUN_OPTIONS and value != defaults[name]]
+        mode = "с отрисовкой" if not config.headless else "без отрисовки"
+        return f"{mode}: " + (", ".join(changed) if changed else "по умолчанию")
 
-        self.simulation_thread.start()
-
-    def handle_output(self, output):
-        current_text = self.results_text.toPlainText()
-        if current_text and current_text != 'Симуляция запущена...':
-            new_text = current_text + "\n" + output
-        else:
-            new_text = output
-        self.results_text.setPlainText(new_text)
-
-    def on_simulation_finished(self):
-        self.run_button.setEnabled(True)
-        self.parse_simulation_results(self.results_text.toPlainText())
-
-    def parse_simulation_results(self, output):
-        lines = output.split('\n')
-        results_text = ""
-
-        detection_found = False
-
-        for line in lines:
-            line = line.strip()
-            if line.startswith("Обнаружение одной цивилизации происходит раз в"):
-                results_text += line + "\n"
-                detection_found = True
-            elif line.startswith("Число цивилизаций, появившихся и исчезнувших за это время:"):
-                results_text += line + "\n"
-                detection_found = True
-            elif line.startswith("Средняя доля обнаружений на одну цивилизацию:"):
-                results_text += line
-                detection_found = True
-
-        if not detection_found:
-            for line in lines:
-                if "обнаружений не произошло" in line:
-                    results_text = line
-                    break
-            else:
-                results_text = "Не удалось извлечь результаты симуляции"
-
-        self.results_text.setPlainText(results_text)
-
-    def generate_script(self, params):
-        with open("FP_logic.py", "r", encoding="utf-8") as f:
-            original_script = f.read()
-
-        replacements = {
-            "N = 500": f"N = {int(params['N'])}",
-            "R = 400": f"R = {int(params['R'])}",
-            "Disp = 900": f"Disp = {int(params['Disp'])}",
-            "A = 1000": f"A = {int(params['A'])}",
-            "spaceships_speed = 0.5": f"spaceships_speed = {float(params['spaceships_speed'])}",
-            "t_signal = 3": f"t_signal = {int(params['t_signal'])}",
-            "t_stop = 1000": f"t_stop = {int(params['t_stop'])}",
-            "clock.tick(100)": f"clock.tick({int(params['FPS'])})",
-            "t_range = [int(6000000 / A), int(100000000 / A)]":
-                f"t_range = [int({int(params['t_range_min'])} / A), int({int(params['t_range_max'])} / A)]",
-            "t_0_range = [int(0 / A), int(100000000 / A)]":
-                f"t_0_range = [int({int(params['t_0_range_min'])} / A), int({int(params['t_0_range_max'])} / A)]",
-            "t_intel_range = [int(4000000 / A), int(6000000 / A)]":
-                f"t_intel_range = [int({int(params['t_intel_range_min'])} / A), int({int(params['t_intel_range_max'])} / A)]",
-            "start_record = 0": f"start_record = {int(params['start_record'])}",
-            "stop_record = 100000": f"stop_record = {int(params['stop_record'])}",
-            "step = 1000": f"step = {int(params['step'])}"
-        }
-
-        for old, new in replacements.items():
-            original_script = original_script.replace(old, new)
-
-        return original_script
+    def run_simulation(self):
+        config = self.read_config()
+        if config is None:
+            return
+        from FP_shared import SharedState
+        shared = SharedState(records=int(config.stop_record / config.step + 1))
+        config.shared_memory = shared.name
+        job = self.add_job(config)
+
+        results_window = ResultsWindow(shared=shared, radius=config.R)
+        results_window.setWindowTitle(f"Результаты симуляции {job}")
+        results_window.show()
+        self.results_windows[job] = results_window
+
+    def queue_simulation(self):
+        config = self.read_config()
+        if config is None:
+            return
+        config.headless = True
+        config.results_path = f"simulation_results_{self.job_count + 1}.npz"
+        self.add_job(config)
+
+    def add_job(self, config):
+        self.job_count += 1
+        job = self.job_count
+        row = self.jobs_table.rowCount()
+        self.jobs_table.insertRow(row)
+        self.jobs_table.setItem(row, 0, QTableWidgetItem(str(job)))
+        self.jobs_table.setItem(row, 1, QTableWidgetItem(self.describe(config)))
+        self.jobs_table.setItem(row, 2, QTableWidgetItem("в очереди"))
+        progress_bar = QProgressBar()
+        progress_bar.setRange(0, 100)
+        progress_bar.setValue(0)
+        self.jobs_table.setCellWidget(row, 3, progress_bar)
+        self.jobs_table.setItem(row, 4, QTableWidgetItem(""))
+        self.jobs[job] = {'row': row, 'progress_bar': progress_bar, 'start': None, 'state': "в очереди"}
+        self.pool.submit(job, config)
+        return job
+
+    def set_state(self, job, state):
+        self.jobs[job]['state'] = state
+        self.jobs_table.item(self.jobs[job]['row'], 2).setText(state)
+
+    def poll_jobs(self):
+        for job, message in self.pool.poll():
+            info = self.jobs[job]
+            if info['state'] == "отменена":
+                continue
+            msg_type = message['type']
+            if msg_type == "progress":
+                now = time.monotonic()
+                if info['start'] is None:
+                    info['start'] = (now, message['time'])
+                    self.set_state(job, "выполняется")
+                elif now > info['start'][0]:
+                    rate = (message['time'] - info['start'][1]) / (now - info['start'][0])
+                    self.jobs_table.item(info['row'], 4).setText(f"{rate:.0f}")
+                info['progress_bar'].setValue(message['percent'])
+                if self.verbose_box.isChecked():
+                    self.log.put(message, job)
+            elif msg_type in ("result", "profile"):
+                self.log.put(message, job)
+            elif msg_type == "error":
+                self.set_state(job, "ошибка")
+                self.log.put(message, job)
+            elif msg_type == "finished" and info['state'] != "ошибка":
+                self.set_state(job, "завершена")
+                info['progress_bar'].setValue(100)
+
+    def flush_log(self):
+        text = self.log.drain()
+        if text:
+            self.results_text.appendPlainText(text)
+
+    def cancel_selected(self):
+        rows = {index.row() for index in self.jobs_table.selectionModel().selectedRows()}
+        for job, info in self.jobs.items():
+            if info['row'] in rows and info['state'] in ("в очереди", "выполняется") and self.pool.cancel(job):
+                self.set_state(job, "отменена")
+                self.log.write("Симуляция отменена", job)
 
     def closeEvent(self, event):
-        if self.simulation_worker and self.simulation_worker.is_running:
-            self.simulation_worker.stop()
-            if self.simulation_thread and self.simulation_thread.is_alive():
-                self.simulation_thread.join(timeout=0.0)
-        os._exit(0)
+        self.poll_timer.stop()
+        self.log_timer.stop()
+        self.pool.close()
+        self.log.close()
+        for results_window in self.results_windows.values():
+            results_window.close()
+        super().closeEvent(event)
 
 
 class ResultsWindow(QMainWindow):
-    def __init__(self, times, civ_number, detected_number):
+    def __init__(self, times=(), civ_number=(), detected_number=(), shared=None, radius=None):
         super().__init__()
-        self.times = times
-        self.civ_number = civ_number
-        self.detected_number = detected_number
+        self.shared = shared
+        self.radius = radius
+        self.snapshot_time = None
+        self.times = []
+        self.civ_number = []
+        self.detected_number = []
+        self.sum_xx = 0.0
+        self.sum_x_civ = 0.0
+        self.sum_x_detected = 0.0
+        self.changed = True
+        self.background = None
         self.setWindowTitle("Результаты симуляции")
         self.setGeometry(100, 100, 900, 1000)
         self.initUI()
         self.center()
         self.apply_styles()
-        self.calculate_results()
+        for point in zip(times, civ_number, detected_number):
+            self.add_point(*point)
+        self.refresh()
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start(100)
 
     def center(self):
         screen = QApplication.primaryScreen()
@@ -445,6 +482,9 @@ class ResultsWindow(QMainWindow):
         """)
 
     def initUI(self):
+        import matplotlib.pyplot as plt
+        from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
         layout = QVBoxLayout(central_widget)
@@ -465,6 +505,7 @@ class ResultsWindow(QMainWindow):
 
         self.canvas = FigureCanvas(self.figure)
         layout.addWidget(self.canvas)
+        self.init_plots()
 
         self.results_text = QTextEdit()
         self.results_text.setReadOnly(True)
@@ -476,11 +517,49 @@ class ResultsWindow(QMainWindow):
         close_button.clicked.connect(self.close)
         layout.addWidget(close_button)
 
-    def calculate_results(self):
-        X_civ = self.times.reshape(-1, 1)
+    def closeEvent(self, event):
+        self.timer.stop()
+        if self.shared is not None:
+            self.shared.close()
+            self.shared = None
+        super().closeEvent(event)
+
+    def poll_shared(self):
+        if self.shared is None:
+            return
+        for point in zip(*(column.tolist() for column in self.shared.read_metrics(len(self.times)))):
+            self.add_point(*point)
+        snapshot = self.shared.read_population()
+        if snapshot is None:
+            return
+        now, points = snapshot
+        if now != self.snapshot_time and len(points):
+            import numpy as np
+            from FP_shared import WAS_DETECTED
+            self.snapshot_time = now
+            self.population_points.set_offsets(np.column_stack((points['x'], points['y'])))
+            self.population_points.set_color(np.where((points['flags'] & WAS_DETECTED)[:, None] > 0,
+                                                      self.detected_color, self.civ_color))
+            self.snapshot_label.set_text(f"{now} тыс. лет")
+            self.changed = True
+
+    def add_point(self, time, civ_number, detected_number):
+        time = float(time)
+        self.times.append(time)
+        self.civ_number.append(float(civ_number))
+        self.detected_number.append(float(detected_number))
+        self.sum_xx += time * time
+        self.sum_x_civ += time * civ_number
+        self.sum_x_detected += time * detected_number
+        self.changed = True
+
+    def slopes(self):
+        if self.sum_xx == 0:
+            return 0.0, 0.0
+        return self.sum_x_civ / self.sum_xx, self.sum_x_detected / self.sum_xx
 
-        k_civ = np.linalg.lstsq(X_civ, self.civ_number, rcond=None)[0][0]
-        k_detected = np.linalg.lstsq(X_civ, self.detected_number, rcond=None)[0][0]
+    def calculate_results(self):
+        k_civ, k_detected = self.slopes()
 
         if k_detected * k_civ != 0:
             result_text = f"""Обнаружение одной цивилизации происходит раз в {1 / k_detected:.4f} тыс. лет
@@ -492,49 +571,91 @@ class ResultsWindow(QMainWindow):
             result_text = "За рассматриваемый диапазон времени симуляции обнаружений не произошло"
 
         self.results_text.setText(result_text)
-        self.plot_results()
-
-    def plot_results(self):
-        for ax in self.axes:
-            ax.clear()
-
-        X_civ = self.times.reshape(-1, 1)
-        k_civ = np.linalg.lstsq(X_civ, self.civ_number, rcond=None)[0][0]
-        k_detected = np.linalg.lstsq(X_civ, self.detected_number, rcond=None)[0][0]
 
+    def init_plots(self):
         data_color = '#bb86fc'
         fit_color = '#03dac6'
-        background_color = '#3c3c3c'
-        text_color = 'white'
 
-        for ax in self.axes:
-            ax.set_facecolor(background_color)
-            ax.tick_params(colors=text_color)
-            ax.xaxis.label.set_color(text_color)
-            ax.yaxis.label.set_color(text_color)
-            ax.title.set_color(text_color)
-            ax.title.set_fontsize(14)
-            ax.xaxis.label.set_fontsize(12)
-            ax.yaxis.label.set_fontsize(12)
-            for spine in ax.spines.values():
-                spine.set_color(text_color)
-
-        self.axes[0].plot(self.times, self.civ_number, 'o', color=data_color, markersize=3, label='Данные')
-        self.axes[0].plot(self.times, k_civ * self.times, '-', color=fit_color, linewidth=2, label='Аппроксимация')
+        self.civ_points, = self.axes[0].plot([], [], 'o', color=data_color, markersize=3, label='Данные',
+                                             animated=True)
+        self.civ_fit, = self.axes[0].plot([], [], '-', color=fit_color, linewidth=2, label='Аппроксимация',
+                                          animated=True)
         self.axes[0].set_xlabel("время, тыс. лет", fontsize=12)
         self.axes[0].set_ylabel("число сигналов", fontsize=12)
         self.axes[0].set_title("Рост числа сигналов со временем", fontsize=13)
-        self.axes[0].legend(loc='best', fontsize=11)
+        self.axes[0].legend(loc='upper left', fontsize=11)
 
-        self.axes[1].plot(self.times, self.detected_number, 'o', color=data_color, markersize=3, label='Данные')
-        self.axes[1].plot(self.times, k_detected * self.times, '-', color=fit_color, linewidth=2, label='Аппроксимация')
+        self.detected_points, = self.axes[1].plot([], [], 'o', color=data_color, markersize=3, label='Данные',
+                                                  animated=True)
+        self.detected_fit, = self.axes[1].plot([], [], '-', color=fit_color, linewidth=2, label='Аппроксимация',
+                                               animated=True)
         self.axes[1].set_xlabel("время, тыс. лет", fontsize=12)
         self.axes[1].set_ylabel("число обнаружений", fontsize=12)
         self.axes[1].set_title("Динамика обнаружений", fontsize=13)
-        self.axes[1].legend(loc='best', fontsize=11)
-
+        self.axes[1].legend(loc='upper left', fontsize=11)
+
+        from matplotlib.colors import to_rgba
+        self.civ_color = to_rgba('white')
+        self.detected_color = to_rgba(fit_color)
+        self.population_points = self.axes[2].scatter([], [], s=4, animated=True)
+        self.snapshot_label = self.axes[2].text(0.02, 0.95, "", transform=self.axes[2].transAxes, color='white',
+                                                fontsize=11, verticalalignment='top', animated=True)
+        self.axes[2].set_title("Состояние популяции", fontsize=13)
+        self.axes[2].set_aspect('equal')
+        if self.radius:
+            self.axes[2].set_xlim(-self.radius, self.radius)
+            self.axes[2].set_ylim(-self.radius, self.radius)
+
+        for ax in self.axes[:2]:
+            ax.set_xlim(0, 1)
+            ax.set_ylim(0, 1)
         self.figure.tight_layout()
-        self.canvas.draw()
+        self.canvas.mpl_connect('draw_event', self.on_draw)
+
+    def animated_artists(self):
+        return (self.civ_points, self.civ_fit, self.detected_points, self.detected_fit, self.population_points,
+                self.snapshot_label)
+
+    def on_draw(self, event):
+        self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+        for artist in self.animated_artists():
+            self.figure.draw_artist(artist)
+
+    def rescale(self):
+        if not self.times:
+            return False
+        rescaled = False
+        x_max = self.times[-1]
+        for ax, values in ((self.axes[0], self.civ_number), (self.axes[1], self.detected_number)):
+            if x_max > ax.get_xlim()[1]:
+                ax.set_xlim(0, 1.5 * x_max)
+                rescaled = True
+            if values[-1] > ax.get_ylim()[1]:
+                ax.set_ylim(0, 1.5 * values[-1])
+                rescaled = True
+        return rescaled
+
+    def refresh(self):
+        self.poll_shared()
+        if not self.changed:
+            return
+        self.changed = False
+
+        k_civ, k_detected = self.slopes()
+        x_fit = [0, self.times[-1]] if self.times else []
+        self.civ_points.set_data(self.times, self.civ_number)
+        self.civ_fit.set_data(x_fit, [k_civ * x for x in x_fit])
+        self.detected_points.set_data(self.times, self.detected_number)
+        self.detected_fit.set_data(x_fit, [k_detected * x for x in x_fit])
+        self.calculate_results()
+
+        if self.rescale() or self.background is None:
+            self.canvas.draw()
+        else:
+            self.canvas.restore_region(self.background)
+            for artist in self.animated_artists():
+                self.figure.draw_artist(artist)
+            self.canvas.blit(self.figure.bbox)
 
 
 def main():
@@ -557,6 +678,7 @@ def main():
     app.setPalette(dark_palette)
 
     if len(sys.argv) > 1 and sys.argv[1] == "--results":
+        import numpy as np
         data = np.load("simulation_results.npz")
         results_window = ResultsWindow(data['times'], data['civ_number'], data['detected_number'])
         results_window.show()
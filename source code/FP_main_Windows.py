@@ -3,11 +3,13 @@ import sys
 import threading
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                              QHBoxLayout, QPushButton, QLabel, QLineEdit,
-                             QGroupBox, QTextEdit, QScrollArea, QSplitter)
+                             QGroupBox, QPlainTextEdit, QScrollArea, QSplitter, QProgressBar)
 from PyQt6.QtGui import QPalette, QColor, QPixmap
-from PyQt6.QtCore import Qt, pyqtSignal, QObject
+from PyQt6.QtCore import Qt, pyqtSignal, QObject, QTimer
 import multiprocessing
-import queue
+from FP_config import Config
+from FP_worker import SimulationProcess
+from FP_log import LogBuffer
 
 
 def resource_path(relative_path):
@@ -19,81 +21,46 @@ def resource_path(relative_path):
     return os.path.join(base_path, relative_path)
 
 
-def run_simulation_process(script_content, output_queue):
-    try:
-        script_dir = os.path.dirname(os.path.abspath(sys.argv[0]))
-        script_path = os.path.join(script_dir, "FP_logic_temp.py")
-
-        with open(script_path, "w", encoding="utf-8") as f:
-            f.write(script_content)
-
-        sys.path.insert(0, script_dir)
-
-        import FP_logic_temp
-
-        import io
-        import contextlib
-
-        f = io.StringIO()
-        with contextlib.redirect_stdout(f):
-            FP_logic_temp.main()
-
-        output = f.getvalue()
-        output_queue.put(("output", output))
-
-        try:
-            os.remove(script_path)
-            os.remove(os.path.join(script_dir, "__pycache__", "FP_logic_temp.cpython-310.pyc"))
-        except:
-            pass
-
-    except Exception as e:
-        import traceback
-        error_msg = f"Ошибка выполнения: {str(e)}\n{traceback.format_exc()}"
-        output_queue.put(("error", error_msg))
-
-
 class SimulationWorker(QObject):
     finished = pyqtSignal()
-    output_received = pyqtSignal(str)
     error_occurred = pyqtSignal(str)
+    progress_updated = pyqtSignal(int)
+    result_received = pyqtSignal(dict)
 
-    def __init__(self, script_path, modified_content, original_content):
+    def __init__(self, simulation_process, config):
         super().__init__()
-        self.modified_content = modified_content
+        self.simulation_process = simulation_process
+        self.config = config
         self.is_running = False
-        self.process = None
-        self.output_queue = multiprocessing.Queue()
 
     def run_simulation(self):
         self.is_running = True
         try:
-            self.process = multiprocessing.Process(
-                target=run_simulation_process,
-                args=(self.modified_content, self.output_queue),
-                daemon=True
-            )
-            self.process.start()
-
-            self.reader_thread = threading.Thread(target=self.read_output, daemon=True)
-            self.reader_thread.start()
-
+            self.simulation_process.submit(self.config)
         except Exception as e:
             self.error_occurred.emit(f"Ошибка запуска: {str(e)}")
             self.is_running = False
+            self.finished.emit()
+            return
+        self.read_output()
 
     def read_output(self):
         while self.is_running:
             try:
-                msg_type, content = self.output_queue.get(timeout=0.1)
-                if msg_type == "output":
-                    self.output_received.emit(content)
+                message = self.simulation_process.get()
+                if message is None:
+                    if not self.simulation_process.is_alive():
+                        break
+                    continue
+                msg_type = message['type']
+                if msg_type == "progress":
+                    self.progress_updated.emit(message['percent'])
+                elif msg_type == "result":
+                    self.result_received.emit(message)
                 elif msg_type == "error":
-                    self.error_occurred.emit(content)
-            except queue.Empty:
-                if self.process and not self.process.is_alive():
+                    self.error_occurred.emit(message['message'])
+                elif msg_type == "finished":
                     break
-                continue
             except Exception as e:
                 self.error_occurred.emit(f"Ошибка чтения вывода: {str(e)}")
                 break
@@ -103,11 +70,7 @@ class SimulationWorker(QObject):
 
     def stop(self):
         self.is_running = False
-        if self.process and self.process.is_alive():
-            self.process.terminate()
-            self.process.join(timeout=0.1)
-            if self.process.is_alive():
-                self.process.kill()
+        self.simulation_process.terminate()
 
 
 class ParameterWindow(QMainWindow):
@@ -116,16 +79,17 @@ class ParameterWindow(QMainWindow):
         self.setWindowTitle("Настройки")
         self.setGeometry(100, 100, 1400, 800)
         self.simulation_worker = None
-
-        self.script_path = "FP_logic.py"
-        script_path = resource_path("FP_logic.py")
-        with open(script_path, "r", encoding="utf-8") as f:
-            self.original_script = f.read()
+        self.simulation_process = SimulationProcess()
+        self.log = LogBuffer()
 
         self.initUI()
         self.center()
         self.apply_styles()
 
+        self.log_timer = QTimer(self)
+        self.log_timer.timeout.connect(self.flush_log)
+        self.log_timer.start(200)
+
     def center(self):
         screen = QApplication.primaryScreen()
         screen_geometry = screen.geometry()
@@ -194,7 +158,7 @@ class ParameterWindow(QMainWindow):
                 background-color: #555;
                 color: #888;
             }
-            QTextEdit {
+            QTextEdit, QPlainTextEdit {
                 background-color: #424242;
                 border: 1px solid #555;
                 border-radius: 4px;
@@ -229,7 +193,8 @@ class ParameterWindow(QMainWindow):
             ("spaceships_speed", "Скорость кораблей в долях от скорости света", "0.5"),
             ("t_signal", "Время генерации сигнала (тыс. лет)", "3"),
             ("t_stop", "Время существования сигнала (тыс. лет)", "1000"),
-            ("FPS", "Максимальная величина FPS", "100")
+            ("FPS", "Максимальная величина FPS", "100"),
+            ("speed", "Скорость симуляции (тыс. лет в секунду, 0 - максимальная)", "100")
         ]
 
         for param_name, label_text, default_value in main_parameters:
@@ -338,8 +303,9 @@ class ParameterWindow(QMainWindow):
         results_label.setStyleSheet("font-size: 18px; font-weight: bold; color: #4fc3f7; padding: 13px;")
         results_layout.addWidget(results_label)
 
-        self.results_text = QTextEdit()
+        self.results_text = QPlainTextEdit()
         self.results_text.setReadOnly(True)
+        self.results_text.setMaximumBlockCount(5000)
         self.results_text.setPlaceholderText("Результаты симуляции появятся здесь после завершения...")
         self.results_text.setStyleSheet("font-size: 15px;")
         results_layout.addWidget(self.results_text)
@@ -349,98 +315,60 @@ class ParameterWindow(QMainWindow):
 
         main_layout.addWidget(splitter)
 
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setValue(0)
+        main_layout.addWidget(self.progress_bar)
+
         self.run_button = QPushButton("Запустить симуляцию")
         self.run_button.clicked.connect(self.run_simulation)
         main_layout.addWidget(self.run_button)
 
     def run_simulation(self):
         self.results_text.clear()
+        self.progress_bar.setValue(0)
         self.run_button.setEnabled(False)
 
         try:
-            params = {key: widget.text() for key, widget in self.params.items()}
-        except Exception:
-            params = {}
+            config = Config.from_dict({key: widget.text() for key, widget in self.params.items()})
+        except ValueError as e:
+            self.log.write(f"Некорректные параметры: {e}")
+            self.run_button.setEnabled(True)
+            return
 
-        modified_content = self.generate_script(params)
-        self.simulation_worker = SimulationWorker(self.script_path, modified_content, self.original_script)
-        self.simulation_worker.output_received.connect(self.handle_output)
+        if not self.simulation_process.is_alive():
+            self.simulation_process = SimulationProcess()
+
+        self.simulation_worker = SimulationWorker(self.simulation_process, config)
         self.simulation_worker.error_occurred.connect(self.handle_error)
+        self.simulation_worker.progress_updated.connect(self.progress_bar.setValue)
+        self.simulation_worker.result_received.connect(self.handle_result)
         self.simulation_worker.finished.connect(self.on_simulation_finished)
 
         threading.Thread(target=self.simulation_worker.run_simulation, daemon=True).start()
 
-    def handle_output(self, output):
-        self.results_text.append(output)
-
     def handle_error(self, err_text):
-        self.results_text.append(err_text)
+        self.log.write(err_text)
         self.run_button.setEnabled(True)
 
-    def on_simulation_finished(self):
-        self.run_button.setEnabled(True)
-        self.parse_simulation_results(self.results_text.toPlainText())
-
-    def parse_simulation_results(self, output):
-        lines = output.split('\n')
-        results_text = ""
-
-        detection_found = False
-
-        for line in lines:
-            line = line.strip()
-            if line.startswith("Обнаружение одной цивилизации происходит раз в"):
-                results_text += line + "\n"
-                detection_found = True
-            elif line.startswith("Число цивилизаций, появившихся и исчезнувших за это время:"):
-                results_text += line + "\n"
-                detection_found = True
-            elif line.startswith("Средняя доля обнаружений на одну цивилизацию:"):
-                results_text += line
-                detection_found = True
-
-        if not detection_found:
-            for line in lines:
-                if "обнаружений не произошло" in line:
-                    results_text = line
-                    break
-            else:
-                results_text = "Не удалось извлечь результаты симуляции"
+    def handle_result(self, result):
+        self.log.put(result)
 
-        self.results_text.setPlainText(results_text)
+    def flush_log(self):
+        text = self.log.drain()
+        if text:
+            self.results_text.appendPlainText(text)
 
-    def generate_script(self, params):
-        script_content = self.original_script
-        try:
-            replacements = {
-                "N = 500": f"N = {int(params.get('N', 500))}",
-                "R = 400": f"R = {int(params.get('R', 400))}",
-                "Disp = 900": f"Disp = {int(params.get('Disp', 900))}",
-                "A = 1000": f"A = {int(params.get('A', 1000))}",
-                "spaceships_speed = 0.5": f"spaceships_speed = {float(params.get('spaceships_speed', 0.5))}",
-                "t_signal = 3": f"t_signal = {int(params.get('t_signal', 3))}",
-                "t_stop = 1000": f"t_stop = {int(params.get('t_stop', 1000))}",
-                "clock.tick(100)": f"clock.tick({int(params.get('FPS', 100))})",
-                "t_range = [int(6000000 / A), int(100000000 / A)]":
-                    f"t_range = [int({int(params.get('t_range_min', 1000000))} / A), int({int(params.get('t_range_max', 100000000))} / A)]",
-                "t_0_range = [int(0 / A), int(100000000 / A)]":
-                    f"t_0_range = [int({int(params.get('t_0_range_min', 0))} / A), int({int(params.get('t_0_range_max', 100000000))} / A)]",
-                "t_intel_range = [int(4000000 / A), int(6000000 / A)]":
-                    f"t_intel_range = [int({int(params.get('t_intel_range_min', 4000000))} / A), int({int(params.get('t_intel_range_max', 6000000))} / A)]",
-                "start_record = 0": f"start_record = {int(params.get('start_record', 0))}",
-                "stop_record = 100000": f"stop_record = {int(params.get('stop_record', 100000))}",
-                "step = 1000": f"step = {int(params.get('step', 1000))}"
-            }
-            for old, new in replacements.items():
-                script_content = script_content.replace(old, new)
-        except Exception:
-            script_content = self.original_script
-        return script_content
+    def on_simulation_finished(self):
+        self.run_button.setEnabled(True)
 
     def closeEvent(self, event):
         try:
             if self.simulation_worker and getattr(self.simulation_worker, "is_running", False):
                 self.simulation_worker.stop()
+            self.simulation_process.close()
+            self.log_timer.stop()
+            self.log.close()
         except Exception:
             pass
         event.accept()
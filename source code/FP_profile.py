@@ -0,0 +1,81 @@
+import time
+
+
+class Profiler:
+    def __init__(self, sample=1, clock=time.perf_counter):
+        self.sample = max(1, sample)
+        self.clock = clock
+        self.reset()
+
+    def reset(self):
+        self.seconds = {}
+        self.counters = {}
+        self.ticks = 0
+        self.sampled = 0
+        self.active = False
+        self.phase = None
+        self.start = 0.0
+
+    def begin(self, tick):
+        if self.active:
+            self.end()
+        self.ticks += 1
+        self.active = tick % self.sample == 0
+        if self.active:
+            self.sampled += 1
+            self.phase = None
+
+    def mark(self, phase):
+        if not self.active:
+            return
+        now = self.clock()
+        if self.phase is not None:
+            self.seconds[self.phase] = self.seconds.get(self.phase, 0.0) + now - self.start
+        self.phase = phase
+        self.start = now
+
+    def count(self, name, value):
+        if self.active:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def end(self):
+        self.mark(None)
+        self.active = False
+
+    def summary(self):
+        sampled = max(1, self.sampled)
+        total = sum(self.seconds.values())
+        phases = {phase: {'seconds': seconds, 'share': seconds / total if total else 0.0,
+                          'per_tick': seconds / sampled}
+                  for phase, seconds in sorted(self.seconds.items(), key=lambda item: -item[1])}
+        return {'ticks': self.ticks, 'sampled': self.sampled, 'seconds': total, 'phases': phases,
+                'counters': {name: value / sampled for name, value in sorted(self.counters.items())}}
+
+
+def format_summary(summary):
+    lines = [f"Профиль: {summary['sampled']} из {summary['ticks']} шагов, {summary['seconds']:.3f} с"]
+    for phase, stats in summary['phases'].items():
+        lines.append(f"  {phase:<20} {stats['per_tick'] * 1e6:10.1f} мкс/шаг {stats['share'] * 100:6.1f}%")
+    for name, value in summary['counters'].items():
+        lines.append(f"  {name:<20} {value:10.3f} за шаг")
+    return "\n".join(lines)
+
+
+class ProfileReporter:
+    def __init__(self, profiler, send, interval=5.0):
+        self.profiler = profiler
+        self.send = send
+        self.interval = interval
+        self.last = time.monotonic()
+
+    def message(self, now):
+        return dict(self.profiler.summary(), type='profile', time=now)
+
+    def __call__(self, simulation):
+        now = time.monotonic()
+        if now - self.last >= self.interval:
+            self.last = now
+            self.send(self.message(simulation.time - 1))
+
+    def finish(self, results):
+        self.send(self.message(results['time']))
@@ -0,0 +1,65 @@
+import sys
+import json
+import time
+
+METRICS = ('time', 'population', 'signals', 'detections', 'active_signals', 'ships',
+           'visits', 'contacts', 'missed_visits')
+
+
+def progress_message(simulation):
+    now = simulation.time - 1
+    message = {'type': 'progress', 'time': now,
+               'percent': max(0, min(100, int(100 * now / simulation.stop_record))) if simulation.stop_record else 100}
+    message.update(zip(METRICS[1:], simulation.metrics()[1:]))
+    return message
+
+
+def metrics_message(times, civ_number, detected_number, index):
+    return {'type': 'metrics', 'time': float(times[index]), 'signals': int(civ_number[index]),
+            'detections': int(detected_number[index])}
+
+
+def result_message(results, report):
+    message = {'type': 'result', 'report': report}
+    for name, value in results.items():
+        if not hasattr(value, '__len__'):
+            message[name] = value
+    return message
+
+
+def encode(message):
+    return json.dumps(message, ensure_ascii=False)
+
+
+def decode(line):
+    return json.loads(line)
+
+
+def emit(message, stream=None):
+    stream = sys.stdout if stream is None else stream
+    stream.write(encode(message) + "\n")
+    stream.flush()
+
+
+class ProgressReporter:
+    def __init__(self, send, interval=0.1):
+        self.send = send
+        self.interval = interval
+        self.last = 0.0
+        self.recorded = 0
+
+    def __call__(self, simulation):
+        if simulation.array_count > self.recorded:
+            for index in range(self.recorded, simulation.array_count):
+                self.send(metrics_message(simulation.times, simulation.civ_number, simulation.detected_number, index))
+            self.recorded = simulation.array_count
+        now = time.monotonic()
+        if now - self.last >= self.interval:
+            self.last = now
+            self.send(progress_message(simulation))
+
+    def finish(self, results):
+        for index in range(self.recorded, results['recorded']):
+            self.send(metrics_message(results['times'], results['civ_number'], results['detected_number'], index))
+        self.recorded = results['recorded']
+        self.send({'type': 'progress', 'time': results['time'], 'percent': 100})
@@ -0,0 +1,56 @@
+import os
+import json
+import numpy as np
+from FP_protocol import METRICS
+
+
+def metrics_dtype(columns):
+    return np.dtype([(name, np.int64) for name in columns])
+
+
+class Recorder:
+    def __init__(self, path, columns=METRICS, chunk=1024, append=False):
+        self.path = path
+        self.columns = tuple(columns)
+        self.dtype = metrics_dtype(self.columns)
+        self.buffer = np.zeros(chunk, dtype=self.dtype)
+        self.count = 0
+        with open(path + '.json', 'w', encoding='utf-8') as f:
+            json.dump({'columns': self.columns, 'dtype': '<i8'}, f)
+        self.file = open(path, 'ab' if append else 'wb')
+        self.rows = self.file.tell() // self.dtype.itemsize
+
+    def append(self, row):
+        self.buffer[self.count] = row
+        self.count += 1
+        self.rows += 1
+        if self.count == len(self.buffer):
+            self.flush()
+
+    def flush(self):
+        if self.count:
+            self.file.write(self.buffer[:self.count].tobytes())
+            self.file.flush()
+            self.count = 0
+
+    def truncate(self, rows):
+        self.flush()
+        size = rows * self.dtype.itemsize
+        if size > os.fstat(self.file.fileno()).st_size:
+            raise ValueError(f"{self.path}: в файле метрик меньше {rows} строк, записанных до контрольной точки")
+        self.file.truncate(size)
+        self.rows = rows
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+
+def read_metrics(path):
+    with open(path + '.json', 'r', encoding='utf-8') as f:
+        description = json.load(f)
+    dtype = metrics_dtype(description['columns'])
+    rows = os.path.getsize(path) // dtype.itemsize
+    if rows == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode='r', shape=(rows,))
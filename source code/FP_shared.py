@@ -0,0 +1,144 @@
+import math
+import time
+import numpy as np
+from multiprocessing import shared_memory
+
+MAGIC = 0x46505348
+HEADER = ('magic', 'sequence', 'records', 'record_capacity', 'population', 'population_capacity',
+          'stride', 'time', 'finished')
+SEQUENCE = HEADER.index('sequence')
+RECORDS = HEADER.index('records')
+POPULATION = HEADER.index('population')
+STRIDE = HEADER.index('stride')
+TIME = HEADER.index('time')
+FINISHED = HEADER.index('finished')
+
+METRIC_COLUMNS = ('time', 'signals', 'detections')
+POINT_DTYPE = np.dtype([('x', '<f4'), ('y', '<f4'), ('flags', 'u1')])
+WAS_DETECTED = 1
+DETECTED_OTHERS = 2
+INTEL = 4
+
+
+def layout(records, population):
+    header_size = len(HEADER) * 8
+    metrics_size = len(METRIC_COLUMNS) * records * 8
+    return header_size, metrics_size, population * POINT_DTYPE.itemsize
+
+
+class SharedState:
+    def __init__(self, name=None, records=0, population=4096):
+        self.owner = name is None
+        if self.owner:
+            self.memory = shared_memory.SharedMemory(create=True, size=max(1, sum(layout(records, population))))
+        else:
+            self.memory = shared_memory.SharedMemory(name=name)
+            header = np.ndarray(len(HEADER), dtype=np.int64, buffer=self.memory.buf)
+            if header[0] != MAGIC:
+                del header
+                self.memory.close()
+                raise ValueError(f"{name}: не является блоком общей памяти симуляции")
+            records = int(header[HEADER.index('record_capacity')])
+            population = int(header[HEADER.index('population_capacity')])
+            del header
+
+        header_size, metrics_size, population_size = layout(records, population)
+        buffer = self.memory.buf
+        self.header = np.ndarray(len(HEADER), dtype=np.int64, buffer=buffer)
+        self.metrics = np.ndarray((len(METRIC_COLUMNS), records), dtype=np.float64, buffer=buffer,
+                                  offset=header_size)
+        self.points = np.ndarray(population, dtype=POINT_DTYPE, buffer=buffer, offset=header_size + metrics_size)
+        if self.owner:
+            self.header[:] = 0
+            self.header[HEADER.index('record_capacity')] = records
+            self.header[HEADER.index('population_capacity')] = population
+            self.header[0] = MAGIC
+
+    @property
+    def name(self):
+        return self.memory.name
+
+    def records(self):
+        return int(self.header[RECORDS])
+
+    def finished(self):
+        return bool(self.header[FINISHED])
+
+    def publish_metrics(self, times, civ_number, detected_number, count):
+        start = int(self.header[RECORDS])
+        count = min(count, self.metrics.shape[1])
+        if count <= start:
+            return
+        self.metrics[0, start:count] = times[start:count]
+        self.metrics[1, start:count] = civ_number[start:count]
+        self.metrics[2, start:count] = detected_number[start:count]
+        self.header[RECORDS] = count
+
+    def publish_population(self, population, now):
+        capacity = len(self.points)
+        stride = max(1, math.ceil(population.n / capacity)) if capacity else 1
+        slots = slice(0, population.n, stride)
+        count = len(range(population.n)[slots]) if capacity else 0
+
+        header = self.header
+        header[SEQUENCE] += 1
+        points = self.points[:count]
+        points['x'] = population.x[slots]
+        points['y'] = population.y[slots]
+        points['flags'] = (population.was_detected[slots] * WAS_DETECTED
+                           + population.detected_others[slots] * DETECTED_OTHERS
+                           + population.intel[slots] * INTEL)
+        header[POPULATION] = count
+        header[STRIDE] = stride
+        header[TIME] = now
+        header[SEQUENCE] += 1
+
+    def finish(self):
+        self.header[FINISHED] = 1
+
+    def read_metrics(self, start=0):
+        count = self.records()
+        return self.metrics[0, start:count], self.metrics[1, start:count], self.metrics[2, start:count]
+
+    def read_population(self, attempts=100):
+        header = self.header
+        for _ in range(attempts):
+            sequence = int(header[SEQUENCE])
+            if sequence % 2 == 0:
+                count = int(header[POPULATION])
+                now = int(header[TIME])
+                points = self.points[:count].copy()
+                if int(header[SEQUENCE]) == sequence:
+                    return now, points
+            time.sleep(0)
+        return None
+
+    def close(self):
+        self.header = self.metrics = self.points = None
+        self.memory.close()
+        if self.owner:
+            try:
+                self.memory.unlink()
+            except FileNotFoundError:
+                pass
+
+
+class SharedPublisher:
+    def __init__(self, state, interval=0.1):
+        self.state = state
+        self.interval = interval
+        self.last = 0.0
+
+    def __call__(self, simulation):
+        self.state.publish_metrics(simulation.times, simulation.civ_number, simulation.detected_number,
+                                   simulation.array_count)
+        now = time.monotonic()
+        if now - self.last >= self.interval:
+            self.last = now
+            self.state.publish_population(simulation.population, simulation.time - 1)
+
+    def finish(self, simulation):
+        self.state.publish_metrics(simulation.times, simulation.civ_number, simulation.detected_number,
+                                   simulation.array_count)
+        self.state.publish_population(simulation.population, simulation.time - 1)
+        self.state.finish()
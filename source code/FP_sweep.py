@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import argparse
+import hashlib
+import itertools
+import json
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from FP_config import Config, RUN_OPTIONS
+from FP_core import Simulation, warmup
+from FP_events import EventSimulation
+
+DEFAULTS = {name: value for name, value in Config().to_dict().items() if name not in RUN_OPTIONS}
+
+
+def normalize(point):
+    unknown = set(point) - set(DEFAULTS)
+    if unknown:
+        raise ValueError(f"Неизвестные параметры: {', '.join(sorted(unknown))}")
+    return {name: type(default)(point.get(name, default)) for name, default in DEFAULTS.items()}
+
+
+def simulation_parameters(point):
+    return Config.from_dict(normalize(point)).simulation_parameters()
+
+
+def expand_grid(grid):
+    names = list(grid)
+    values = [value if isinstance(value, (list, tuple)) else [value] for value in grid.values()]
+    return [dict(zip(names, combination)) for combination in itertools.product(*values)]
+
+
+def run_point(point, seed, replicate, event_driven=True):
+    simulation_class = EventSimulation if event_driven else Simulation
+    simulation = simulation_class(**simulation_parameters(point),
+                                  seed=np.random.SeedSequence(seed, spawn_key=(replicate,)))
+    simulation.run()
+    k_civ, k_detected = simulation.slopes()
+    return {
+        'k_civ': float(k_civ),
+        'k_detected': float(k_detected),
+        'find_count': simulation.find_count,
+        'signals_emitted_count': simulation.signals_emitted_count,
+        'contact_count': simulation.contact_count,
+        'visit_count': simulation.visit_count,
+        'missed_visit_count': simulation.missed_visit_count,
+    }
+
+
+class ResultStore:
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def key(self, point, seed, replicate, event_driven=True):
+        description = {'parameters': normalize(point), 'seed': seed, 'replicate': replicate,
+                       'event_driven': event_driven, 'random': 'splitmix64'}
+        return hashlib.sha256(json.dumps(description, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def filename(self, key):
+        return os.path.join(self.path, key + '.json')
+
+    def get(self, key):
+        try:
+            with open(self.filename(key), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key, record):
+        temp_path = self.filename(key) + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(record, f, ensure_ascii=False, indent=1)
+        os.replace(temp_path, self.filename(key))
+
+
+def run_sweep(points, store, seeds=1, seed=0, workers=None, event_driven=True):
+    pending = []
+    for point in points:
+        for replicate in range(seeds):
+            key = store.key(point, seed, replicate, event_driven)
+            record = store.get(key)
+            if record is None:
+                pending.append((key, point, replicate))
+            else:
+                yield record
+
+    if not pending:
+        return
+    with ProcessPoolExecutor(max_workers=workers, initializer=warmup) as executor:
+        futures = {executor.submit(run_point, point, seed, replicate, event_driven): (key, point, replicate)
+                   for key, point, replicate in pending}
+        for future in as_completed(futures):
+            key, point, replicate = futures[future]
+            record = {'parameters': normalize(point), 'seed': seed, 'replicate': replicate,
+                      'event_driven': event_driven}
+            try:
+                record['result'] = future.result()
+            except Exception as e:
+                record['error'] = f"{type(e).__name__}: {e}"
+                yield record
+                continue
+            store.put(key, record)
+            yield record
+
+
+def parse_values(text):
+    values = []
+    for item in text.split(','):
+        number = float(item)
+        values.append(int(number) if number.is_integer() and '.' not in item else number)
+    return values
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Перебор параметров симуляции с сохранением результатов")
+    parser.add_argument("--set", action="append", default=[], metavar="ИМЯ=ЗНАЧ1,ЗНАЧ2",
+                        help="значения параметра для сетки, например N=200,500,1000")
+    parser.add_argument("--points", help="JSON-файл со списком точек (словарей параметров)")
+    parser.add_argument("--store", default="sweep_results")
+    parser.add_argument("--seeds", type=int, default=1, help="число повторов на каждую точку")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--ticks", action="store_true", help="пошаговый режим вместо событийного")
+    args = parser.parse_args()
+
+    grid = {}
+    for item in args.set:
+        name, values = item.split("=", 1)
+        if name not in DEFAULTS:
+            parser.error(f"неизвестный параметр: {name}")
+        grid[name] = parse_values(values)
+    if args.points:
+        with open(args.points, 'r', encoding='utf-8') as f:
+            points = json.load(f)
+    else:
+        points = expand_grid(grid)
+    for point in points:
+        try:
+            simulation_parameters(point)
+        except ValueError as e:
+            parser.error(f"{point}: {e}")
+
+    total = len(points) * args.seeds
+    failed = 0
+    for done, record in enumerate(run_sweep(points, ResultStore(args.store), args.seeds, args.seed,
+                                            args.workers, not args.ticks), start=1):
+        changed = {name: value for name, value in record['parameters'].items() if value != DEFAULTS[name]}
+        if 'error' in record:
+            failed += 1
+            print(f"[{done}/{total}] {changed} повтор {record['replicate']}: ошибка {record['error']}",
+                  file=sys.stderr, flush=True)
+            continue
+        result = record['result']
+        print(f"[{done}/{total}] {changed} повтор {record['replicate']}: "
+              f"k_civ = {result['k_civ']:.6f}, k_detected = {result['k_detected']:.6f}", flush=True)
+    if failed:
+        sys.exit(f"Не посчитано запусков: {failed}; повторный запуск посчитает только их")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+import os
+
+os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'
+import pygame
+import math
+import time
+import numpy as np
+
+BLACK = (0, 0, 0)
+WHITE = (255, 255, 255)
+BLUE = (0, 0, 255)
+RED = (255, 0, 0)
+GREEN = (0, 255, 0)
+YELLOW = (255, 255, 0)
+GRAY = (128, 128, 128)
+
+GLIDER_PATTERNS = [
+    [(-1, 0), (0, -1), (0, -2), (-1, -2), (-2, -2)],
+    [(-2, 0), (0, 0), (0, -1), (-1, -1), (-1, -2)],
+    [(-2, -1), (-1, -2), (0, 0), (0, -1), (0, -2)],
+    [(-2, 0), (-2, -2), (-1, -2), (-1, -1), (0, -1)]
+]
+HEADINGS = 64
+CELL_SIZE = 2
+SPRITE_SIZE = 16
+
+
+class PygameView:
+    def __init__(self, disp, t_signal, stop_record, fps=100, speed=None):
+        self.disp = disp
+        self.t_signal = t_signal
+        self.stop_record = stop_record
+        self.fps = fps
+        self.speed = fps if speed is None else speed
+        self.ticks_per_frame = 1
+        self.pending_ticks = 0
+        self.tick_cost = 0.0
+        self.render_cost = 0.0
+        self.frame_start = time.perf_counter()
+
+        pygame.init()
+        self.screen = pygame.display.set_mode((disp, disp))
+        pygame.display.set_caption("Симуляция парадокса Ферми")
+        self.clock = pygame.time.Clock()
+        self.font = pygame.font.Font(None, 36)
+        self.small_font = pygame.font.Font(None, 30)
+        self.labels = {}
+        self.sprites = [[self.glider_sprite(heading, frame) for frame in range(len(GLIDER_PATTERNS))]
+                        for heading in range(HEADINGS)]
+
+    def glider_sprite(self, heading, frame):
+        angle = 2 * math.pi * heading / HEADINGS
+        sprite = pygame.Surface((SPRITE_SIZE, SPRITE_SIZE), pygame.SRCALPHA)
+        center = SPRITE_SIZE // 2
+        for dx, dy in GLIDER_PATTERNS[frame]:
+            rotated_x = dx * math.cos(angle) - dy * math.sin(angle)
+            rotated_y = dx * math.sin(angle) + dy * math.cos(angle)
+            pygame.draw.rect(sprite, YELLOW,
+                             (int(center + rotated_x * CELL_SIZE - CELL_SIZE / 2),
+                              int(center + rotated_y * CELL_SIZE - CELL_SIZE / 2),
+                              CELL_SIZE, CELL_SIZE))
+        return sprite.convert_alpha()
+
+    def label(self, key, text, font, color):
+        cached = self.labels.get(key)
+        if cached is None or cached[0] != text:
+            cached = (text, font.render(text, True, color))
+            self.labels[key] = cached
+        return cached[1]
+
+    def draw_fleet(self, ships):
+        x, y, direction_x, direction_y, frames = ships
+        if len(x) == 0:
+            return
+        headings = np.round(np.arctan2(direction_y, direction_x) * HEADINGS / (2 * math.pi)).astype(np.int64)
+        headings %= HEADINGS
+        left = (x + self.disp / 2).astype(np.int64) - SPRITE_SIZE // 2
+        top = (y + self.disp / 2).astype(np.int64) - SPRITE_SIZE // 2
+        sprites = self.sprites
+        self.screen.blits([(sprites[heading][frame], (sprite_x, sprite_y)) for heading, frame, sprite_x, sprite_y
+                           in zip(headings.tolist(), frames.tolist(), left.tolist(), top.tolist())], False)
+
+    def draw_population(self, population):
+        for i in range(population.n):
+            center = (int(population.x[i] + self.disp / 2), int(population.y[i] + self.disp / 2))
+            point_color = GREEN if population.was_detected[i] else WHITE
+            pygame.draw.circle(self.screen, point_color, center, 2)
+            if population.detected_others[i]:
+                pygame.draw.circle(self.screen, BLUE, center, 4, 2)
+            if population.signal_active[i] and population.intel[i]:
+                pygame.draw.circle(self.screen, RED, center, int(population.signal_radius[i]), self.t_signal)
+
+    def draw_text(self, simulation):
+        time = simulation.time - 1
+        screen = self.screen
+        font = self.font
+
+        screen.blit(self.label('finds', f"Обнаружения: {simulation.find_count}", font, WHITE), (10, 60))
+        screen.blit(self.label('signals', f"Сигналы: {simulation.signals_emitted_count}", font, WHITE), (10, 110))
+        screen.blit(self.label('contacts', f"Контакты: {simulation.contact_count}", font, WHITE), (10, self.disp - 40))
+        screen.blit(self.label('visits', f"Визиты: {simulation.visit_count}", font, WHITE), (10, self.disp - 90))
+        screen.blit(self.label('time', f"Время: {time} тыс. лет", font, WHITE), (10, 10))
+
+        if time < self.stop_record:
+            progress_percent = int((time / self.stop_record) * 100)
+            record_text = f"идет запись данных: {progress_percent}%"
+        else:
+            record_text = "данные симуляции записаны"
+        text = self.label('record', record_text, self.small_font, GRAY)
+        text_rect = text.get_rect(center=(screen.get_width() // 2, self.disp - 25))
+        screen.blit(text, text_rect)
+
+    def adapt(self):
+        if self.tick_cost <= 0:
+            return
+        budget = 1 / self.fps if self.fps > 0 else 0.0
+        if self.speed > 0 and self.speed * self.tick_cost < 1:
+            ticks = max(self.speed * budget, self.speed * self.render_cost / (1 - self.speed * self.tick_cost))
+        else:
+            ticks = max(budget - self.render_cost, self.render_cost) / self.tick_cost
+        self.ticks_per_frame = max(1, int(math.ceil(ticks)))
+
+    def __call__(self, simulation):
+        self.pending_ticks += 1
+        if self.pending_ticks < self.ticks_per_frame:
+            return
+
+        render_start = time.perf_counter()
+        tick_cost = (render_start - self.frame_start) / self.pending_ticks
+        self.tick_cost = tick_cost if self.tick_cost == 0 else 0.8 * self.tick_cost + 0.2 * tick_cost
+        self.pending_ticks = 0
+
+        profiler = simulation.profiler
+        if profiler:
+            profiler.mark('view.events')
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                simulation.stop()
+
+        if profiler:
+            profiler.mark('view.draw')
+        self.screen.fill(BLACK)
+        self.draw_population(simulation.population)
+        self.draw_fleet(simulation.ships())
+        self.draw_text(simulation)
+
+        pygame.display.flip()
+        render_cost = time.perf_counter() - render_start
+        self.render_cost = render_cost if self.render_cost == 0 else 0.8 * self.render_cost + 0.2 * render_cost
+        if profiler:
+            profiler.mark('view.wait')
+        if self.speed > 0:
+            self.clock.tick(self.speed / self.ticks_per_frame)
+        if profiler:
+            profiler.mark('observers')
+        self.adapt()
+        self.frame_start = time.perf_counter()
+
+    def close(self):
+        pygame.display.quit()
+        pygame.quit()
@@ -0,0 +1,158 @@
+import os
+import queue
+import importlib
+import collections
+import traceback
+import multiprocessing
+
+
+def worker_loop(requests, responses):
+    import FP_core
+    import FP_logic
+    from FP_protocol import ProgressReporter, result_message
+    from FP_profile import Profiler, ProfileReporter
+
+    try:
+        FP_core.warmup()
+    except Exception as e:
+        responses.put({'type': 'error', 'message': f"Ошибка компиляции ядра: {str(e)}\n{traceback.format_exc()}"})
+        return
+    try:
+        # Preload pygame so the first visual run does not pay for its import
+        importlib.import_module('FP_view')
+    except ImportError:
+        # headless runs work without pygame; a visual run reports the import error itself
+        pass
+    responses.put({'type': 'ready'})
+
+    while True:
+        config = requests.get()
+        if config is None:
+            break
+        try:
+            observers = [ProgressReporter(responses.put)]
+            profiler = Profiler(config.profile_sample) if config.profile_sample > 0 else None
+            if profiler is not None:
+                observers.append(ProfileReporter(profiler, responses.put))
+            results = FP_logic.run(config, observers=observers, profiler=profiler)
+            for observer in observers:
+                observer.finish(results)
+            responses.put(result_message(results, FP_logic.report(results)))
+            if config.headless:
+                FP_logic.save_results(results, config.results_path)
+            elif config.show_plot:
+                FP_logic.plot_results(results)
+        except Exception as e:
+            responses.put({'type': 'error', 'message': f"Ошибка выполнения: {str(e)}\n{traceback.format_exc()}"})
+        responses.put({'type': 'finished'})
+
+
+class SimulationProcess:
+    def __init__(self):
+        context = multiprocessing.get_context("spawn")
+        self.requests = context.Queue()
+        self.responses = context.Queue()
+        self.process = context.Process(target=worker_loop, args=(self.requests, self.responses), daemon=True)
+        self.process.start()
+
+    def submit(self, config):
+        self.requests.put(config)
+
+    def get(self, timeout=0.1):
+        try:
+            return self.responses.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def is_alive(self):
+        return self.process.is_alive()
+
+    def terminate(self):
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(timeout=0.1)
+            if self.process.is_alive():
+                self.process.kill()
+
+    def close(self):
+        if self.process.is_alive():
+            self.requests.put(None)
+            self.process.join(timeout=1)
+        self.terminate()
+
+
+class JobPool:
+    def __init__(self, workers=None, warm=1):
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.warm = warm
+        self.pending = collections.deque()
+        self.running = {}
+        self.idle = []
+        self.spawn()
+
+    def submit(self, job, config):
+        self.pending.append((job, config))
+        self.dispatch()
+
+    def dispatch(self):
+        while self.pending and len(self.running) < self.workers:
+            job, config = self.pending.popleft()
+            process = self.idle.pop() if self.idle else SimulationProcess()
+            process.submit(config)
+            self.running[job] = process
+
+    def spawn(self):
+        while len(self.idle) < self.warm and len(self.idle) + len(self.running) < self.workers:
+            self.idle.append(SimulationProcess())
+
+    def poll(self):
+        messages = []
+        for job, process in list(self.running.items()):
+            message = process.get(timeout=0)
+            while message is not None:
+                messages.append((job, message))
+                if message['type'] == 'finished':
+                    del self.running[job]
+                    self.idle.append(process)
+                    break
+                message = process.get(timeout=0)
+            if job in self.running and not process.is_alive():
+                del self.running[job]
+                messages.append((job, {'type': 'error', 'message': "Процесс симуляции неожиданно завершился"}))
+                messages.append((job, {'type': 'finished'}))
+        self.dispatch()
+        self.shrink()
+        self.spawn()
+        return messages
+
+    def cancel(self, job):
+        for index, (pending_job, _) in enumerate(self.pending):
+            if pending_job == job:
+                del self.pending[index]
+                return True
+        process = self.running.pop(job, None)
+        if process is None:
+            return False
+        process.terminate()
+        self.dispatch()
+        self.spawn()
+        return True
+
+    def resize(self, workers):
+        self.workers = max(1, workers)
+        self.shrink()
+        self.dispatch()
+        self.spawn()
+
+    def shrink(self):
+        while self.idle and (len(self.idle) > self.warm or len(self.idle) + len(self.running) > self.workers):
+            self.idle.pop().close()
+
+    def close(self):
+        self.pending.clear()
+        for process in self.running.values():
+            process.terminate()
+        for process in self.idle:
+            process.close()
+        self.running.clear()
+        self.idle.clear()
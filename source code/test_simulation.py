@@ -0,0 +1,104 @@
+import multiprocessing
+import numpy as np
+import pytest
+from concurrent.futures import ProcessPoolExecutor
+from FP_config import Config
+from FP_core import Simulation
+from FP_events import EventSimulation
+from FP_recorder import Recorder, read_metrics
+from FP_checkpoint import save_checkpoint, load_checkpoint
+
+COUNTERS = ('find_count', 'signals_emitted_count', 'contact_count', 'visit_count', 'missed_visit_count',
+            'array_count')
+ARRAYS = ('times', 'civ_number', 'detected_number')
+
+ENGINES = {
+    'step': (Simulation, {}),
+    'kernel': (Simulation, {'threads': 2}),
+    'kernel1': (Simulation, {'threads': 1}),
+    'events': (EventSimulation, {}),
+}
+
+
+def parameters(**overrides):
+    return Config(**dict(dict(N=300, R=100, stop_record=1500, step=50, t_intel_range_min=100000,
+                              t_intel_range_max=500000, t_range_min=1000000, t_range_max=3000000),
+                         **overrides)).simulation_parameters()
+
+
+def simulate(engine, seed, recorder=None, **overrides):
+    simulation_class, options = ENGINES[engine]
+    simulation = simulation_class(**parameters(**overrides), seed=seed, recorder=recorder, **options)
+    simulation.run()
+    return simulation
+
+
+def outcome(simulation):
+    return ({name: getattr(simulation, name) for name in COUNTERS},
+            {name: getattr(simulation, name).tolist() for name in ARRAYS})
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_engines_agree(seed):
+    reference = outcome(simulate('step', seed))
+    assert reference[0]['find_count'] > 0
+    for engine in ('kernel', 'kernel1', 'events'):
+        assert outcome(simulate(engine, seed)) == reference, engine
+
+
+@pytest.mark.parametrize("engine", list(ENGINES))
+def test_resume_matches_uninterrupted_run(engine, tmp_path):
+    recorder = Recorder(str(tmp_path / "full.bin"))
+    reference = outcome(simulate(engine, 1, recorder))
+    recorder.close()
+
+    simulation_class, options = ENGINES[engine]
+    metrics_path = str(tmp_path / "resumed.bin")
+    recorder = Recorder(metrics_path)
+    simulation = simulation_class(**parameters(), seed=1, recorder=recorder, **options)
+    simulation.run(until=700)
+    save_checkpoint(simulation_class, simulation.snapshot(), str(tmp_path / "checkpoint.pkl"))
+    simulation.run(until=900)
+    recorder.close()
+
+    recorder = Recorder(metrics_path, append=True)
+    resumed = load_checkpoint(str(tmp_path / "checkpoint.pkl"), recorder)
+    resumed.run()
+    recorder.close()
+    assert outcome(resumed) == reference
+    assert np.array_equal(read_metrics(metrics_path), read_metrics(str(tmp_path / "full.bin")))
+
+
+def test_stationary_ships_are_not_launched():
+    reference = simulate('step', 1, spaceships_speed=0)
+    assert reference.find_count > 0
+    assert reference.fleet.count == 0
+    for engine in ('kernel', 'events'):
+        simulation = simulate(engine, 1, spaceships_speed=0)
+        assert outcome(simulation) == outcome(reference), engine
+        assert simulation.metrics() == reference.metrics(), engine
+
+
+def simulate_outcome(engine, seed):
+    return outcome(simulate(engine, seed))
+
+
+def test_seed_reproduces_across_processes():
+    seeds = np.random.SeedSequence(7).spawn(3)
+    reference = [simulate_outcome('step', seed) for seed in seeds]
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=2, mp_context=context) as executor:
+        for engine in ('step', 'events'):
+            assert list(executor.map(simulate_outcome, [engine] * len(seeds), seeds)) == reference, engine
+
+
+def test_resume_rejects_missing_metrics(tmp_path):
+    simulation = Simulation(**parameters(), seed=1, recorder=Recorder(str(tmp_path / "metrics.bin")))
+    simulation.run(until=700)
+    save_checkpoint(Simulation, simulation.snapshot(), str(tmp_path / "checkpoint.pkl"))
+    simulation.recorder.close()
+
+    recorder = Recorder(str(tmp_path / "missing.bin"), append=True)
+    with pytest.raises(ValueError):
+        load_checkpoint(str(tmp_path / "checkpoint.pkl"), recorder)
+    recorder.close()